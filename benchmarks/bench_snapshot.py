@@ -0,0 +1,63 @@
+"""Benchmark memori & kecepatan diff: set of int vs FollowingSnapshot (array int64)
+
+Jalankan: python benchmarks/bench_snapshot.py
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot import FollowingSnapshot  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000]
+NEW_FOLLOWS = 20
+REPEAT = 20
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+
+def measure_time(func):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def run(size):
+    # ID Twitter asli ~19 digit, jadi tidak di-cache sebagai small int
+    ids = random.sample(range(10**17, 10**18), size + NEW_FOLLOWS)
+    old_ids = ids[:size]
+    new_ids = ids[NEW_FOLLOWS:]  # 20 follow baru, 20 unfollow
+
+    # `x + 1` bikin objek int baru, sama seperti ID hasil parse JSON dari API
+    old_set, set_bytes = measure_memory(lambda: {x + 1 for x in old_ids})
+    old_snap, snap_bytes = measure_memory(lambda: FollowingSnapshot(x + 1 for x in old_ids))
+    new_ids = [x + 1 for x in new_ids]
+    new_set = set(new_ids)
+    new_snap = FollowingSnapshot(new_ids)
+
+    assert set(new_snap - old_snap) == new_set - old_set
+
+    set_ms = measure_time(lambda: (new_set - old_set, old_set - new_set))
+    snap_ms = measure_time(lambda: (new_snap - old_snap, old_snap - new_snap))
+
+    print(
+        f"{size:>8,} | {set_bytes / size:>7.1f} B/id | {snap_bytes / size:>7.1f} B/id"
+        f" | {set_ms:>8.2f} ms | {snap_ms:>8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    print(f"{'IDs':>8} | {'set mem':>12} | {'array mem':>12} | {'set diff':>11} | {'array diff':>11}")
+    for size in SIZES:
+        run(size)
@@ -0,0 +1,145 @@
+"""Tes latency command: /status dan /list tetap responsif selama check_following
+
+FakeTwitter dengan latency per request (default 0.5 detik) melayani pre-check
+dan fetch following semua akun, sementara /status dan /list "datang" dengan
+jadwal tetap lewat Update palsu. Yang diukur: waktu dari command datang sampai
+reply terkirim. Gagal (exit code 1) kalau command paling lambat melewati
+--threshold.
+
+--inline menjalankan call tweepy langsung di event loop (seperti sebelum ada
+thread pool) sebagai pembanding; dengan opsi itu tes diharapkan gagal.
+
+Jalankan: python benchmarks/command_latency.py [--accounts 5] [--latency 0.5] [--threshold 0.25]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import Executor, Future
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+os.environ.setdefault('TRACKER_DB_PATH', os.path.join(tempfile.mkdtemp(), 'command_latency.db'))
+
+import bot  # noqa: E402
+from fakes import FakeTelegramBot, FakeTwitter  # noqa: E402
+
+
+class InlineExecutor(Executor):
+    """Executor yang menjalankan fungsi langsung (blocking) di thread pemanggil"""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def fake_update(replies, chat_id=1001):
+    async def reply_text(text, **kwargs):
+        replies.append(time.perf_counter())
+
+    return SimpleNamespace(
+        message=SimpleNamespace(reply_text=reply_text, chat_id=chat_id),
+        effective_chat=SimpleNamespace(id=chat_id),
+        effective_user=SimpleNamespace(id=chat_id),
+    )
+
+
+def build_tracker(args):
+    twitter = FakeTwitter(latency=args.latency)
+    tracker = bot.TwitterFollowingTracker(
+        [{'name': 'cred1', 'bearer_token': 'fake'}], '1:fake',
+        client_factory=twitter.client_factory, telegram_bot=FakeTelegramBot()
+    )
+    if args.inline:
+        tracker.twitter_executor = InlineExecutor()
+
+    chain = next(iter(bot.CHAINS))
+    next_id = 10**12
+    for idx in range(args.accounts):
+        account_id = idx + 1
+        twitter.add_user(account_id, f"ct{account_id}")
+        twitter.following[account_id] = list(range(next_id, next_id + args.following))
+        next_id += args.following
+        snapshot = bot.FollowingSnapshot(twitter.following[account_id])
+        tracker.register_account(f"ct{account_id}", twitter.user_object(account_id), chain, snapshot)
+        # following_count berubah -> pre-check memaksa fetch following
+        twitter.add_user(next_id, f"t{next_id}")
+        twitter.follow(account_id, next_id)
+        next_id += 1
+    return tracker, twitter
+
+
+async def probe(tracker, latencies, interval, done):
+    """Command "datang" tiap interval (jadwal tetap); latency = datang -> reply terkirim
+
+    Kalau event loop tertahan call blocking, handler baru jalan setelah loop bebas,
+    jadi keterlambatan itu ikut terukur.
+    """
+    replies = []
+    update = fake_update(replies)
+    handlers = [('status', tracker.status_command), ('list', tracker.list_accounts)]
+    arrival = time.perf_counter()
+    while not done.is_set():
+        arrival += interval
+        await asyncio.sleep(max(0, arrival - time.perf_counter()))
+        for name, handler in handlers:
+            await handler(update, SimpleNamespace(args=[]))
+            latencies.setdefault(name, []).append(replies[-1] - arrival)
+
+
+async def run(args):
+    tracker, twitter = build_tracker(args)
+    latencies = {}
+    done = asyncio.Event()
+
+    prober = asyncio.create_task(probe(tracker, latencies, args.interval, done))
+    # Command pertama datang sebelum check dimulai (baseline tanpa beban)
+    await asyncio.sleep(args.interval)
+    started = time.perf_counter()
+    await tracker.check_following()
+    check_seconds = time.perf_counter() - started
+    done.set()
+    await prober
+    tracker.twitter_executor.shutdown(wait=False)
+    return check_seconds, latencies, dict(twitter.calls)
+
+
+def report(args, check_seconds, latencies, calls):
+    print(f"check_following: {check_seconds:.1f}s, {args.accounts} akun x {args.following} following,"
+          f" latency {args.latency}s/request, {'inline' if args.inline else 'thread pool'}")
+    print(f"request Twitter: {calls}")
+    worst = 0.0
+    for name, values in latencies.items():
+        values = sorted(values)
+        worst = max(worst, values[-1])
+        print(f"/{name:<7}: {len(values)} kali | p50 {values[len(values) // 2] * 1000:.1f} ms"
+              f" | maks {values[-1] * 1000:.1f} ms")
+    ok = worst <= args.threshold
+    print(f"{'OK' if ok else 'GAGAL'}: command paling lambat {worst * 1000:.1f} ms (batas {args.threshold * 1000:.0f} ms)")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--accounts', type=int, default=5)
+    parser.add_argument('--following', type=int, default=3000, help="baseline following per akun")
+    parser.add_argument('--latency', type=float, default=0.5, help="detik per request Twitter palsu")
+    parser.add_argument('--interval', type=float, default=0.2, help="jeda antar command")
+    parser.add_argument('--threshold', type=float, default=0.25, help="batas latency command (detik)")
+    parser.add_argument('--inline', action='store_true', help="call tweepy di event loop (pembanding)")
+    parser.add_argument('--verbose', action='store_true', help="tampilkan log bot")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        bot.logger.setLevel(logging.ERROR)
+
+    results = asyncio.run(run(args))
+    sys.exit(0 if report(args, *results) else 1)
@@ -0,0 +1,205 @@
+"""Backend palsu untuk benchmark offline: Twitter API v2 (users, following) dan Telegram sendMessage
+
+FakeTwitter menyimpan state bersama (following per akun, budget rate limit per
+credential) dan membuat client per credential lewat `client_factory`, jadi bisa
+dipasang langsung ke FollowingMonitor / TwitterFollowingTracker:
+
+    twitter = FakeTwitter(window=15)
+    tracker = TwitterFollowingTracker(creds, token, client_factory=twitter.client_factory,
+                                      telegram_bot=FakeTelegramBot())
+
+Header x-rate-limit-* dikirim seperti API asli, request di luar budget dapat 429.
+FakeTelegramBot menegakkan limit global / per chat dan melempar RetryAfter.
+"""
+import asyncio
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+import tweepy
+from telegram.error import RetryAfter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot import DEFAULT_RATE_LIMITS, endpoint_key  # noqa: E402
+
+
+class FakeResponse:
+    """Cukup untuk tweepy.errors.HTTPException (status, reason, headers, json)"""
+
+    def __init__(self, status_code, reason, headers):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+
+    def json(self):
+        return {'title': self.reason, 'detail': self.reason}
+
+
+class FakeTwitter:
+    """State server Twitter palsu yang dipakai bersama semua client/credential"""
+
+    def __init__(self, limits=None, window=900, latency=0.0, error_rate=0.0, seed=0):
+        self.limits = dict(DEFAULT_RATE_LIMITS, **(limits or {}))
+        self.window = window
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.users = {}
+        self.usernames = {}
+        self.following = {}
+        self.buckets = {}
+        self.calls = Counter()
+        self.rate_limited = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_user(user_id, username=None, followers=1000, tweets=100):
+        return {
+            'id': str(user_id),
+            'username': username or f"user{user_id}",
+            'name': (username or f"user{user_id}").title(),
+            'description': '',
+            'created_at': '2020-01-01T00:00:00.000Z',
+            'public_metrics': {'followers_count': followers, 'following_count': 0, 'tweet_count': tweets},
+        }
+
+    def add_user(self, user_id, username=None, followers=1000, tweets=100):
+        user = self.make_user(user_id, username, followers, tweets)
+        self.users[user_id] = user
+        self.usernames[user['username'].lower()] = user_id
+        self.following.setdefault(user_id, [])
+        return user
+
+    def follow(self, account_id, target_id):
+        """Follow baru muncul paling depan, seperti urutan endpoint asli"""
+        with self.lock:
+            self.following[account_id].insert(0, target_id)
+
+    def unfollow(self, account_id, target_id):
+        with self.lock:
+            self.following[account_id].remove(target_id)
+
+    def user_object(self, user_id):
+        # User yang tidak didaftarkan (mis. baseline following) dibuat on the fly tanpa disimpan
+        user = dict(self.users.get(user_id) or self.make_user(user_id))
+        user['public_metrics'] = dict(user['public_metrics'], following_count=len(self.following.get(user_id, ())))
+        return tweepy.User(user)
+
+    def consume(self, credential, route):
+        """Pakai satu token budget; return header rate limit atau lempar 429"""
+        endpoint = endpoint_key(route)
+        now = time.time()
+        with self.lock:
+            self.calls[endpoint] += 1
+            limit = self.limits.get(endpoint, 15)
+            bucket = self.buckets.get((credential, endpoint))
+            if bucket is None or now >= bucket['reset']:
+                bucket = {'remaining': limit, 'reset': now + self.window}
+                self.buckets[(credential, endpoint)] = bucket
+            throttled = bucket['remaining'] <= 0 or self.rng.random() < self.error_rate
+            if not throttled:
+                bucket['remaining'] -= 1
+            headers = {
+                'x-rate-limit-limit': str(limit),
+                'x-rate-limit-remaining': str(max(bucket['remaining'], 0)),
+                'x-rate-limit-reset': str(math.ceil(bucket['reset'])),
+            }
+        if self.latency:
+            time.sleep(self.latency)
+        if throttled:
+            self.rate_limited += 1
+            raise tweepy.errors.TooManyRequests(FakeResponse(429, 'Too Many Requests', headers))
+        return headers
+
+    def client_factory(self, credentials, on_headers):
+        return FakeTwitterClient(self, credentials['name'], on_headers)
+
+
+class FakeTwitterClient:
+    """Subset tweepy.Client yang dipakai bot: get_user, get_users, get_users_following"""
+
+    def __init__(self, server, credential, on_headers=None):
+        self.server = server
+        self.credential = credential
+        self.on_headers = on_headers
+
+    def _request(self, route):
+        try:
+            headers = self.server.consume(self.credential, route)
+        except tweepy.errors.TooManyRequests as e:
+            if self.on_headers:
+                self.on_headers(endpoint_key(route), e.response.headers)
+            raise
+        if self.on_headers:
+            self.on_headers(endpoint_key(route), headers)
+
+    def get_user(self, *, id=None, username=None, **kwargs):
+        route = f"/2/users/{id}" if id else f"/2/users/by/username/{username}"
+        self._request(route)
+        user_id = id if id else self.server.usernames.get(username.lower())
+        data = self.server.user_object(user_id) if user_id in self.server.users else None
+        return tweepy.Response(data, {}, [], {})
+
+    def get_users(self, *, ids=None, usernames=None, **kwargs):
+        self._request("/2/users" if ids else "/2/users/by")
+        if ids:
+            found = ids
+        else:
+            found = [self.server.usernames[name.lower()] for name in usernames if name.lower() in self.server.usernames]
+        return tweepy.Response([self.server.user_object(user_id) for user_id in found] or None, {}, [], {})
+
+    def get_users_following(self, id, *, max_results=1000, pagination_token=None, **kwargs):
+        self._request(f"/2/users/{id}/following")
+        with self.server.lock:
+            ids = list(self.server.following.get(id, []))
+        start = int(pagination_token or 0)
+        page = ids[start:start + max_results]
+        meta = {'result_count': len(page)}
+        if start + max_results < len(ids):
+            meta['next_token'] = str(start + max_results)
+        data = [self.server.user_object(user_id) for user_id in page]
+        return tweepy.Response(data or None, {}, [], meta)
+
+
+class FakeTelegramBot:
+    """Pengganti telegram.Bot untuk DeliveryQueue dengan flood limit ala Telegram"""
+
+    def __init__(self, global_rate=30, chat_interval=1.0, group_interval=3.0, latency=0.0, slack=0.05,
+                 on_message=None):
+        self.global_rate = global_rate
+        self.chat_interval = chat_interval
+        self.group_interval = group_interval
+        self.latency = latency
+        self.slack = slack  # toleransi jitter timer, Telegram juga tidak presisi
+        self.on_message = on_message
+        self.chat_last = {}
+        self.recent = deque()
+        self.sent = Counter()
+        self.retry_after = 0
+
+    async def send_message(self, chat_id, text, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        now = time.monotonic()
+
+        while self.recent and now - self.recent[0] >= 1:
+            self.recent.popleft()
+        interval = self.group_interval if chat_id < 0 else self.chat_interval
+        wait = max(
+            interval - (now - self.chat_last.get(chat_id, -math.inf)),
+            1 - (now - self.recent[0]) if len(self.recent) >= self.global_rate else 0
+        )
+        if wait > self.slack:
+            self.retry_after += 1
+            raise RetryAfter(math.ceil(wait))
+
+        self.chat_last[chat_id] = now
+        self.recent.append(now)
+        self.sent[chat_id] += 1
+        if self.on_message:
+            self.on_message(chat_id, text, now)
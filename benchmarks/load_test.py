@@ -0,0 +1,233 @@
+"""Load test offline: TwitterFollowingTracker dengan FakeTwitter + FakeTelegramBot
+
+Skenario: N akun di-track, M chat subscriber, follow event terjadwal (Poisson,
+sebagian akun jauh lebih aktif) selama --duration detik. Laporan:
+  - delay deteksi (follow terjadi -> terdeteksi check_following)
+  - delay kirim (terdeteksi -> sendMessage pertama) dan end-to-end per chat
+  - request API per follow terdeteksi (per endpoint), jumlah 429 dan RetryAfter
+  - memori (tracemalloc) dan jumlah pesan Telegram
+
+Waktu sisi Twitter dipercepat --speed kali (window rate limit, interval polling,
+MIN_CYCLE_SECONDS); delay deteksi juga dilaporkan dalam "menit simulasi".
+Limit Telegram tidak dipercepat.
+
+Jalankan: python benchmarks/load_test.py [--accounts 50] [--subscribers 5] [--follows 200] [--duration 60]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+os.environ.setdefault('TRACKER_DB_PATH', os.path.join(tempfile.mkdtemp(), 'load_test.db'))
+
+import bot  # noqa: E402
+from fakes import FakeTelegramBot, FakeTwitter  # noqa: E402
+
+TARGET_PATTERN = re.compile(r'twitter\.com/(\w+)')
+
+
+def percentiles(values, points=(50, 95, 99)):
+    if not values:
+        return {p: 0.0 for p in points}
+    values = sorted(values)
+    return {p: values[min(len(values) - 1, int(len(values) * p / 100))] for p in points}
+
+
+def scale_time(speed):
+    """Percepat sisi Twitter: window rate limit, polling dan jeda antar cycle"""
+    bot.RATE_LIMIT_WINDOW = bot.RATE_LIMIT_WINDOW / speed
+    bot.MIN_CYCLE_SECONDS = bot.MIN_CYCLE_SECONDS / speed
+    bot.POLL_RECENT_WINDOW = bot.POLL_RECENT_WINDOW / speed
+    return bot.PollingPriority(
+        base=bot.POLL_BASE_INTERVAL / speed,
+        min_interval=bot.POLL_MIN_INTERVAL / speed,
+        max_interval=bot.POLL_MAX_INTERVAL / speed,
+        half_life=bot.POLL_RATE_HALF_LIFE / speed
+    )
+
+
+def build_twitter(args, rng):
+    """State Twitter palsu + jadwal follow (di luar pengukuran memori bot)"""
+    twitter = FakeTwitter(window=bot.RATE_LIMIT_WINDOW, latency=args.api_latency,
+                          error_rate=args.error_rate, seed=args.seed)
+    next_id = 10**12
+    accounts = []
+    for idx in range(args.accounts):
+        account_id = idx + 1
+        twitter.add_user(account_id, f"ct{account_id}")
+        twitter.following[account_id] = list(range(next_id, next_id + args.following))
+        next_id += args.following
+        accounts.append((f"ct{account_id}", account_id))
+
+    # Jadwal follow: 20% akun dapat 80% event
+    hot = accounts[:max(1, len(accounts) // 5)]
+    schedule = []
+    for _ in range(args.follows):
+        username, account_id = rng.choice(hot if rng.random() < 0.8 else accounts)
+        schedule.append((rng.uniform(0, args.duration), account_id, next_id))
+        twitter.add_user(next_id, f"t{next_id}")
+        next_id += 1
+    schedule.sort()
+    return twitter, accounts, schedule
+
+
+def build_tracker(args, twitter, accounts, priority):
+    results = {'events': {}, 'detected': {}, 'delivered': {}, 'first': {}}
+
+    def on_message(chat_id, text, now):
+        for target in TARGET_PATTERN.findall(text):
+            if target in results['events']:
+                results['delivered'].setdefault(target, []).append(now)
+                results['first'].setdefault(target, now)
+
+    telegram = FakeTelegramBot(on_message=on_message)
+    credentials = [{'name': f"cred{i + 1}", 'bearer_token': 'fake'} for i in range(args.credentials)]
+    tracker = bot.TwitterFollowingTracker(
+        credentials, '1:fake', client_factory=twitter.client_factory, telegram_bot=telegram
+    )
+    tracker.priority = priority
+
+    # Akun + baseline langsung ke state (tanpa request baseline)
+    chains = list(bot.CHAINS)[:args.chains]
+    for idx, (username, account_id) in enumerate(accounts):
+        snapshot = bot.FollowingSnapshot(twitter.following[account_id])
+        tracker.register_account(username, twitter.user_object(account_id), chains[idx % len(chains)], snapshot)
+
+    # Subscriber: semua alert, atau (--filtered) satu chain per chat
+    for chat in range(args.subscribers):
+        chat_id = -(1000 + chat) if chat % 2 else 1000 + chat
+        subscription = None
+        if args.filtered:
+            subscription = {'chains': {chains[chat % len(chains)]}, 'accounts': set()}
+        tracker.subscriptions[chat_id] = subscription
+    tracker.rebuild_routes()
+
+    # Deteksi dicatat dari hook on_following_delta
+    on_following_delta = tracker.on_following_delta
+
+    async def record_delta(username, data, added, removed, new_users):
+        now = time.monotonic()
+        for user in new_users:
+            results['detected'].setdefault(user.username, now)
+        await on_following_delta(username, data, added, removed, new_users)
+
+    tracker.on_following_delta = record_delta
+    return tracker, telegram, results
+
+
+async def play(schedule, twitter, results):
+    started = time.monotonic()
+    for at, account_id, target_id in schedule:
+        delay = started + at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        twitter.follow(account_id, target_id)
+        results['events'][f"t{target_id}"] = time.monotonic()
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    priority = scale_time(args.speed)
+    twitter, accounts, schedule = build_twitter(args, rng)
+    # Yang diukur hanya alokasi sisi bot (state, snapshot, index, antrian)
+    tracemalloc.start()
+    tracker, telegram, results = build_tracker(args, twitter, accounts, priority)
+    baseline_memory, _ = tracemalloc.get_traced_memory()
+
+    tracker.delivery.start()
+    await tracker.start_monitoring()
+    await play(schedule, twitter, results)
+
+    # Tunggu sisa deteksi + antrian kirim, maksimal --drain detik
+    deadline = time.monotonic() + args.drain
+    while time.monotonic() < deadline:
+        if len(results['first']) >= len(results['events']) and not tracker.delivery.pending:
+            break
+        await asyncio.sleep(0.5)
+
+    await tracker.stop_monitoring()
+    await tracker.delivery.stop()
+    current_memory, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tracker.twitter_executor.shutdown(wait=False)
+
+    events = results['events']
+    detect = [results['detected'][t] - events[t] for t in events if t in results['detected']]
+    deliver = [results['first'][t] - results['detected'][t] for t in results['first'] if t in results['detected']]
+    end_to_end = [when - events[t] for t in results['delivered'] for when in results['delivered'][t]]
+    api_calls = sum(twitter.calls.values())
+    detected = len(detect)
+
+    report = {
+        'follows': len(events),
+        'detected': detected,
+        'notified': len(results['first']),
+        'detect_sim_minutes': {p: v * args.speed / 60 for p, v in percentiles(detect).items()},
+        'deliver_seconds': percentiles(deliver),
+        'end_to_end_seconds': percentiles(end_to_end),
+        'api_calls': dict(twitter.calls),
+        'api_calls_per_follow': api_calls / detected if detected else None,
+        'rate_limited': twitter.rate_limited,
+        'telegram_messages': sum(telegram.sent.values()),
+        'telegram_retry_after': telegram.retry_after,
+        'memory_baseline_mb': baseline_memory / 2**20,
+        'memory_current_mb': current_memory / 2**20,
+        'memory_peak_mb': peak_memory / 2**20,
+    }
+    return report
+
+
+def print_report(args, report):
+    def fmt(values, unit):
+        return ' | '.join(f"p{p} {v:>7.2f}{unit}" for p, v in values.items())
+
+    print(f"{args.accounts} akun x {args.following} following, {args.subscribers} chat"
+          f"{' (filter chain)' if args.filtered else ''}, {args.credentials} credential, speed x{args.speed}")
+    print(f"follow: {report['follows']} | terdeteksi {report['detected']} | ternotifikasi {report['notified']}")
+    print(f"deteksi (sim)  : {fmt(report['detect_sim_minutes'], ' min')}")
+    print(f"kirim          : {fmt(report['deliver_seconds'], ' s')}")
+    print(f"end-to-end/chat: {fmt(report['end_to_end_seconds'], ' s')}")
+    per_follow = report['api_calls_per_follow']
+    print(f"API: {report['api_calls']} -> {per_follow:.2f} req/follow, 429: {report['rate_limited']}"
+          if per_follow is not None else f"API: {report['api_calls']}, 429: {report['rate_limited']}")
+    print(f"Telegram: {report['telegram_messages']} pesan, RetryAfter: {report['telegram_retry_after']}")
+    print(f"memori: baseline {report['memory_baseline_mb']:.1f} MB | akhir {report['memory_current_mb']:.1f} MB"
+          f" | peak {report['memory_peak_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--accounts', type=int, default=50)
+    parser.add_argument('--following', type=int, default=1000, help="baseline following per akun")
+    parser.add_argument('--subscribers', type=int, default=5)
+    parser.add_argument('--filtered', action='store_true', help="tiap chat hanya langganan satu chain")
+    parser.add_argument('--chains', type=int, default=5)
+    parser.add_argument('--credentials', type=int, default=1)
+    parser.add_argument('--follows', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=60, help="detik wall clock untuk memutar event")
+    parser.add_argument('--drain', type=float, default=60, help="detik tambahan menunggu deteksi/kirim")
+    parser.add_argument('--speed', type=float, default=60, help="percepatan waktu sisi Twitter")
+    parser.add_argument('--api-latency', type=float, default=0.05, help="detik per request Twitter palsu")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="peluang 429 acak per request")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help="simpan laporan ke file JSON untuk dibandingkan")
+    parser.add_argument('--verbose', action='store_true', help="tampilkan log bot")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        bot.logger.setLevel(logging.ERROR)
+
+    report = asyncio.run(run(args))
+    print_report(args, report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'report': report}, f, indent=2)
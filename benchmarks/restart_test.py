@@ -0,0 +1,183 @@
+"""Tes kill/restart: proses bot di-SIGKILL berkali-kali di tengah jalan, DB yang sama
+
+Proses induk memutar jadwal follow (FakeTwitter, deterministik dari --seed dan
+waktu mulai) dan menjalankan bot sebagai proses anak dengan TRACKER_DB_PATH
+yang sama. Anak di-kill (SIGKILL, tanpa shutdown) --restarts kali pada waktu
+acak lalu dijalankan ulang; follow yang terjadi selama bot mati tetap harus
+terdeteksi dari snapshot tersimpan. Setiap alert yang benar-benar terkirim
+(FakeTelegramBot) ditulis ke file log, lalu dicek: tiap follow tepat satu alert
+per chat (tidak ada yang hilang, tidak ada yang dobel).
+
+Restart juga harus hangat: akun dan snapshot dimuat dari DB, tanpa request baseline.
+
+Jalankan: python benchmarks/restart_test.py [--restarts 3] [--follows 40] [--duration 40]
+Exit code 1 kalau ada follow yang hilang atau dobel.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import TARGET_PATTERN, build_twitter, scale_time  # noqa: E402
+
+import bot  # noqa: E402
+from fakes import FakeTelegramBot  # noqa: E402
+
+CHAT_IDS = [1001, -1002]
+
+
+async def run_child(args):
+    """Satu nyawa bot: muat state dari DB (atau seed di start pertama), lalu monitoring"""
+    priority = scale_time(args.speed)
+    twitter, accounts, schedule = build_twitter(args, random.Random(args.seed))
+    targets = {f"t{target_id}" for _, _, target_id in schedule}
+    alerts = open(args.alerts, 'a', buffering=1)
+
+    def on_message(chat_id, text, now):
+        # Ditulis setelah "terkirim"; line-buffered jadi tetap ada walau proses di-kill
+        for target in TARGET_PATTERN.findall(text):
+            if target in targets:
+                alerts.write(f"{chat_id} {target}\n")
+
+    credentials = [{'name': 'cred1', 'bearer_token': 'fake'}]
+    tracker = bot.TwitterFollowingTracker(
+        credentials, '1:fake', client_factory=twitter.client_factory,
+        telegram_bot=FakeTelegramBot(on_message=on_message)
+    )
+    tracker.priority = priority
+
+    if tracker.tracked_accounts:
+        snapshots = sum(1 for data in tracker.tracked_accounts.values() if len(data['following_list']))
+        print(f"[restart] {len(tracker.tracked_accounts)} akun, {snapshots} snapshot dari DB, "
+              f"{sum(twitter.calls.values())} request baseline", flush=True)
+    else:
+        # Start pertama: baseline = following sebelum jadwal follow mana pun
+        chains = list(bot.CHAINS)
+        for idx, (username, account_id) in enumerate(accounts):
+            snapshot = bot.FollowingSnapshot(twitter.following[account_id])
+            tracker.register_account(username, twitter.user_object(account_id), chains[idx % len(chains)], snapshot)
+        for chat_id in CHAT_IDS:
+            tracker.save_subscription(chat_id, None)
+        tracker.store.set_meta('monitoring', 1)
+        print(f"[start] {len(accounts)} akun di-seed", flush=True)
+
+    # Follow yang terjadi selama bot mati sudah ada di sisi Twitter
+    now = time.time()
+    pending = []
+    for at, account_id, target_id in schedule:
+        if args.started + at <= now:
+            twitter.follow(account_id, target_id)
+        else:
+            pending.append((at, account_id, target_id))
+
+    tracker.delivery.start()
+    await tracker.start_monitoring()
+    for at, account_id, target_id in pending:
+        delay = args.started + at - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        twitter.follow(account_id, target_id)
+    # Sisanya menunggu di-kill oleh proses induk
+    await asyncio.Event().wait()
+
+
+def spawn(args, db_path, alerts_path, started):
+    command = [
+        sys.executable, os.path.abspath(__file__), '--child',
+        '--started', repr(started), '--alerts', alerts_path,
+        '--accounts', str(args.accounts), '--following', str(args.following),
+        '--follows', str(args.follows), '--duration', str(args.duration),
+        '--speed', str(args.speed), '--seed', str(args.seed),
+    ]
+    if args.verbose:
+        command.append('--verbose')
+    return subprocess.Popen(command, env=dict(os.environ, TRACKER_DB_PATH=db_path))
+
+
+def read_alerts(path):
+    if not os.path.exists(path):
+        return Counter()
+    with open(path) as f:
+        return Counter(tuple(line.split()) for line in f if line.strip())
+
+
+def run_parent(args):
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, 'restart_test.db')
+    alerts_path = os.path.join(workdir, 'alerts.log')
+    rng = random.Random(args.seed)
+    _, _, schedule = build_twitter(args, random.Random(args.seed))
+    expected = {(str(chat_id), f"t{target_id}") for _, _, target_id in schedule for chat_id in CHAT_IDS}
+
+    started = time.time()
+    for restart in range(args.restarts):
+        proc = spawn(args, db_path, alerts_path, started)
+        time.sleep(rng.uniform(args.min_uptime, args.max_uptime))
+        proc.send_signal(signal.SIGKILL)
+        proc.wait()
+        print(f"[kill {restart + 1}] t={time.time() - started:.1f}s, {sum(read_alerts(alerts_path).values())} alert",
+              flush=True)
+        # Follow tetap terjadi selama bot mati
+        time.sleep(rng.uniform(0, args.max_downtime))
+
+    proc = spawn(args, db_path, alerts_path, started)
+    deadline = started + args.duration + args.drain
+    try:
+        while time.time() < deadline:
+            if time.time() > started + args.duration and expected <= set(read_alerts(alerts_path)):
+                break
+            time.sleep(0.5)
+    finally:
+        proc.send_signal(signal.SIGKILL)
+        proc.wait()
+
+    alerts = read_alerts(alerts_path)
+    missed = sorted(expected - set(alerts))
+    duplicated = sorted(key for key, count in alerts.items() if count > 1)
+    print(f"{len(schedule)} follow x {len(CHAT_IDS)} chat, {args.restarts} kill: "
+          f"{sum(alerts.values())} alert, hilang {len(missed)}, dobel {len(duplicated)}")
+    for chat_id, target in missed[:10]:
+        print(f"  hilang: {target} -> {chat_id}")
+    for chat_id, target in duplicated[:10]:
+        print(f"  dobel: {target} -> {chat_id} ({alerts[(chat_id, target)]}x)")
+    return not missed and not duplicated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--accounts', type=int, default=20)
+    parser.add_argument('--following', type=int, default=500, help="baseline following per akun")
+    parser.add_argument('--follows', type=int, default=40)
+    parser.add_argument('--duration', type=float, default=40, help="detik wall clock untuk memutar event")
+    parser.add_argument('--drain', type=float, default=90, help="detik tambahan menunggu deteksi/kirim")
+    parser.add_argument('--speed', type=float, default=60, help="percepatan waktu sisi Twitter")
+    parser.add_argument('--restarts', type=int, default=3)
+    parser.add_argument('--min-uptime', type=float, default=4)
+    parser.add_argument('--max-uptime', type=float, default=10)
+    parser.add_argument('--max-downtime', type=float, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--verbose', action='store_true', help="tampilkan log bot")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--started', type=float, help=argparse.SUPPRESS)
+    parser.add_argument('--alerts', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    # build_twitter memakai latency/error rate dari argumen load_test
+    args.api_latency = 0.01
+    args.error_rate = 0.0
+
+    if not args.verbose:
+        bot.logger.setLevel(logging.ERROR)
+
+    if args.child:
+        asyncio.run(run_child(args))
+    else:
+        sys.exit(0 if run_parent(args) else 1)
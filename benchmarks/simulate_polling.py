@@ -0,0 +1,211 @@
+"""Simulasi delay deteksi: urutan round-robin vs PollingPriority.plan, keduanya dengan pre-check
+
+Replay timeline sintetis (akun aktif, sedang, dorman + burst) berisi follow dan
+unfollow. Sebagian follow diikuti unfollow akun lama dalam beberapa menit, jadi
+following_count bisa sama sebelum dan sesudah (count collision): follow seperti
+itu tidak terlihat di pre-check dan baru terdeteksi lewat full sync berkala.
+
+Kedua strategi menjalankan logika check_following / check_account yang sama:
+tiap cycle (MIN_CYCLE_SECONDS) pre-check following_count semua akun; count
+berubah -> fetch following; count sama -> cycles_since_full naik, fetch baru
+kalau sudah FULL_SYNC_EVERY; budget following 15 per window 15 menit, cycle
+tertahan sampai reset kalau habis (RateLimiter.acquire). Bedanya hanya akun mana
+yang dicek dan urutannya:
+  - round-robin: semua akun tiap cycle, urutan tetap (perilaku sebelum user-011)
+  - plan: PollingPriority.plan() (berubah duluan, sisanya hanya kalau urgency >= 1)
+  - plan + high: sama, dengan --high akun acak di-/priority high
+
+Delay dilaporkan untuk semua follow, follow yang tertutup count collision
+(terdeteksi lewat full sync), dan follow milik akun yang di-flag high.
+
+Jalankan: python benchmarks/simulate_polling.py [--accounts 50] [--days 7] [--budget 15]
+"""
+import argparse
+import bisect
+import os
+import random
+import sys
+from datetime import datetime
+from itertools import accumulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bot import FULL_SYNC_EVERY, MIN_CYCLE_SECONDS, RATE_LIMIT_WINDOW, USERS_LOOKUP_BATCH, PollingPriority  # noqa: E402
+
+
+def make_timeline(accounts, days, seed, unfollow_rate):
+    """Per akun: list (timestamp, +1 follow / -1 unfollow) terurut"""
+    rng = random.Random(seed)
+    horizon = days * 86400
+    timelines = []
+    for idx in range(accounts):
+        roll = rng.random()
+        if roll < 0.1:
+            per_day = rng.uniform(10, 30)  # akun sangat aktif
+        elif roll < 0.4:
+            per_day = rng.uniform(1, 5)
+        else:
+            per_day = rng.uniform(0, 0.2)  # dorman
+
+        follows = []
+        t = 0.0
+        while per_day > 0:
+            t += rng.expovariate(per_day / 86400)
+            if t >= horizon:
+                break
+            follows.append(t)
+            # Kadang follow beruntun (burst) dalam beberapa menit
+            if rng.random() < 0.1:
+                follows.extend(t + rng.uniform(0, 600) for _ in range(rng.randint(2, 8)))
+
+        events = [(f, 1) for f in follows if f < horizon]
+        # Bersih-bersih following lama tak lama setelah follow -> count bisa tetap sama
+        for f, _ in list(events):
+            if rng.random() < unfollow_rate:
+                u = f + rng.uniform(0, 600)
+                if u < horizon:
+                    events.append((u, -1))
+        timelines.append(sorted(events))
+    return timelines
+
+
+class Replay:
+    """following_count asli per akun + posisi deteksi follow + delay yang terkumpul"""
+
+    def __init__(self, timelines):
+        self.times = [[t for t, _ in events] for events in timelines]
+        self.counts = [list(accumulate(delta for _, delta in events)) for events in timelines]
+        self.follows = [[t for t, delta in events if delta > 0] for events in timelines]
+        self.cursors = [0] * len(timelines)
+        self.delays = {'all': [], 'collision': []}
+
+    def count(self, idx, now):
+        """following_count saat `now` (relatif terhadap baseline)"""
+        position = bisect.bisect_right(self.times[idx], now)
+        return self.counts[idx][position - 1] if position else 0
+
+    def fetch(self, idx, now, collision, groups=()):
+        """Fetch following: semua follow sampai `now` terdeteksi; return jumlahnya"""
+        follows = self.follows[idx]
+        cursor = self.cursors[idx]
+        detected = 0
+        while cursor < len(follows) and follows[cursor] <= now:
+            delay = now - follows[cursor]
+            self.delays['all'].append(delay)
+            if collision:
+                self.delays['collision'].append(delay)
+            for group in groups:
+                self.delays.setdefault(group, []).append(delay)
+            cursor += 1
+            detected += 1
+        self.cursors[idx] = cursor
+        return detected
+
+    def finish(self, horizon, groups_of):
+        # Follow yang belum terdeteksi sampai akhir dihitung delay sampai horizon
+        for idx, follows in enumerate(self.follows):
+            for follow in follows[self.cursors[idx]:]:
+                self.delays['all'].append(horizon - follow)
+                for group in groups_of(idx):
+                    self.delays.setdefault(group, []).append(horizon - follow)
+        return self.delays
+
+
+def simulate(timelines, days, budget, strategy, high=frozenset(), tracked=frozenset()):
+    """Satu run check_following; strategy 'round-robin' atau 'plan'
+
+    tracked: akun yang delay-nya juga dilaporkan terpisah (grup 'tracked'),
+    high: akun dengan priority 'high'.
+    """
+    horizon = days * 86400
+    replay = Replay(timelines)
+    priority = PollingPriority()
+    accounts = [
+        (idx, {'id': idx, 'following_list': True, 'following_count': 0, 'cycles_since_full': 0,
+               'last_check': datetime.fromtimestamp(0), 'follow_rate': 1.0,
+               'priority': 'high' if idx in high else 'normal', 'last_follow': None})
+        for idx in range(len(timelines))
+    ]
+
+    def groups_of(idx):
+        return ('tracked',) if idx in tracked else ()
+
+    tokens = budget
+    window_reset = RATE_LIMIT_WINDOW
+    fetches = 0
+    prechecks = 0
+
+    now = 0.0
+    while now < horizon:
+        started = now
+        metrics = {idx: {'following_count': replay.count(idx, now)} for idx, _ in accounts}
+        prechecks += -(-len(accounts) // USERS_LOOKUP_BATCH)
+        planned = priority.plan(accounts, metrics, now) if strategy == 'plan' else accounts
+
+        for idx, data in planned:
+            # check_account: count sama -> tunggu full sync
+            collision = metrics[idx]['following_count'] == data['following_count']
+            if collision and data['cycles_since_full'] < FULL_SYNC_EVERY:
+                data['cycles_since_full'] += 1
+                priority.observe(data, 0, now)
+                data['last_check'] = datetime.fromtimestamp(now)
+                continue
+
+            if now >= window_reset:
+                tokens = budget
+                window_reset = now + RATE_LIMIT_WINDOW
+            if tokens == 0:
+                # RateLimiter.acquire: cycle tertahan sampai window reset
+                now = window_reset
+                tokens = budget
+                window_reset = now + RATE_LIMIT_WINDOW
+            tokens -= 1
+            fetches += 1
+
+            full_sync = data['cycles_since_full'] >= FULL_SYNC_EVERY
+            detected = replay.fetch(idx, now, collision, groups_of(idx))
+            priority.observe(data, detected, now)
+            data['following_count'] = replay.count(idx, now)
+            # Fetch incremental tidak lengkap -> tetap dihitung menuju full sync
+            data['cycles_since_full'] = 0 if full_sync else data['cycles_since_full'] + 1
+            data['last_check'] = datetime.fromtimestamp(now)
+
+        now = max(now, started + MIN_CYCLE_SECONDS)
+    return replay.finish(horizon, groups_of), fetches, prechecks
+
+
+def summary(delays):
+    if not delays:
+        return "-"
+    delays = sorted(delays)
+    avg = sum(delays) / len(delays) / 60
+    p95 = delays[max(int(len(delays) * 0.95) - 1, 0)] / 60
+    return f"avg {avg:>6.1f} / p95 {p95:>6.1f} min ({len(delays)})"
+
+
+def report(name, delays, fetches, prechecks):
+    print(f"{name:<14} | semua {summary(delays['all'])} | collision {summary(delays['collision'])}"
+          f" | akun high {summary(delays.get('tracked', []))} | {fetches:,} fetch following, {prechecks:,} pre-check")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--accounts', type=int, default=50)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--budget', type=int, default=15, help="request following per window 15 menit")
+    parser.add_argument('--unfollow-rate', type=float, default=0.3, help="peluang follow diikuti unfollow akun lama")
+    parser.add_argument('--high', type=int, default=5, help="jumlah akun acak yang di-/priority high")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    timelines = make_timeline(args.accounts, args.days, args.seed, args.unfollow_rate)
+    high = frozenset(random.Random(args.seed + 1).sample(range(args.accounts), args.high))
+    follows = sum(1 for events in timelines for _, delta in events if delta > 0)
+    unfollows = sum(1 for events in timelines for _, delta in events if delta < 0)
+    print(f"{args.accounts} akun, {args.days} hari: {follows:,} follow, {unfollows:,} unfollow,"
+          f" budget {args.budget}/window, FULL_SYNC_EVERY {FULL_SYNC_EVERY}")
+
+    # "akun high" = akun yang sama di semua run (hanya run terakhir yang benar-benar di-flag)
+    report("round-robin", *simulate(timelines, args.days, args.budget, 'round-robin', tracked=high))
+    report("plan", *simulate(timelines, args.days, args.budget, 'plan', tracked=high))
+    report("plan + high", *simulate(timelines, args.days, args.budget, 'plan', high=high, tracked=high))
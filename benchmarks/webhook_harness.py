@@ -0,0 +1,219 @@
+"""Harness webhook offline: run_webhook asli + client HTTP lokal yang POST update palsu
+
+Bot dijalankan dalam mode webhook (TELEGRAM_WEBHOOK_URL) dengan Bot API palsu
+(FakeBotAPI, dipasang lewat telegram_request) jadi getMe / setWebhook /
+sendMessage tidak keluar jaringan. Client di thread lain:
+  - menunggu /health siap
+  - POST update dengan secret token salah -> harus ditolak (403)
+  - POST --updates update /status ke path webhook, ukur waktu sampai reply terkirim
+  - POST satu /status lagi dengan reply yang lambat lalu kirim SIGINT: graceful
+    shutdown harus menunggu handler itu selesai (reply tetap terkirim)
+
+Jalankan: python benchmarks/webhook_harness.py [--updates 20] [--slow-reply 1.0]
+Exit code 1 kalau ada pengecekan yang gagal.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from telegram.request import BaseRequest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+SECRET = 'harness-secret'
+BOT_USER = {'id': 1, 'is_bot': True, 'first_name': 'Tracker', 'username': 'tracker_bot'}
+DRAIN_CHAT_ID = 9999
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class FakeBotAPI(BaseRequest):
+    """Bot API palsu untuk Application: jawab getMe/setWebhook, catat sendMessage"""
+
+    def __init__(self):
+        self.calls = []
+        self.replies = []  # (waktu, chat_id, text)
+        self.slow_chats = {}  # chat_id -> detik delay sendMessage
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, read_timeout=None, write_timeout=None,
+                         connect_timeout=None, pool_timeout=None):
+        endpoint = url.rsplit('/', 1)[-1]
+        params = request_data.parameters if request_data else {}
+        self.calls.append((endpoint, params))
+        if endpoint == 'getMe':
+            result = BOT_USER
+        elif endpoint in ('sendMessage', 'editMessageText'):
+            chat_id = int(params['chat_id'])
+            delay = self.slow_chats.get(chat_id)
+            if delay:
+                await asyncio.sleep(delay)
+            self.replies.append((time.perf_counter(), chat_id, params.get('text', '')))
+            result = {'message_id': len(self.replies), 'date': int(time.time()),
+                      'chat': {'id': chat_id, 'type': 'private'}, 'text': params.get('text', '')}
+        else:
+            result = True
+        return 200, json.dumps({'ok': True, 'result': result}).encode()
+
+
+def make_update(update_id, chat_id, text):
+    command = text.split()[0]
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': {'id': chat_id, 'is_bot': False, 'first_name': 'Harness'},
+            'text': text,
+            'entities': [{'type': 'bot_command', 'offset': 0, 'length': len(command)}],
+        },
+    }
+
+
+def post(url, payload, secret=SECRET):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), method='POST',
+        headers={'Content-Type': 'application/json', 'X-Telegram-Bot-Api-Secret-Token': secret}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def wait_reply(api, chat_id, timeout=10):
+    deadline = time.perf_counter() + timeout
+    while True:
+        for when, reply_chat, _ in api.replies:
+            if reply_chat == chat_id:
+                return when
+        if time.perf_counter() >= deadline:
+            return None
+        time.sleep(0.005)
+
+
+def client(args, api, webhook_url, health_url, results):
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                with urllib.request.urlopen(health_url, timeout=1) as response:
+                    if response.status == 200:
+                        break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("health endpoint tidak pernah siap")
+                time.sleep(0.1)
+
+        results['wrong_secret'] = post(webhook_url, make_update(1, 4999, '/status'), secret='salah')
+
+        latencies = []
+        for idx in range(args.updates):
+            chat_id = 5000 + idx
+            sent = time.perf_counter()
+            status = post(webhook_url, make_update(idx + 2, chat_id, '/status'))
+            replied = wait_reply(api, chat_id)
+            if status == 200 and replied is not None:
+                latencies.append(replied - sent)
+        results['latencies'] = latencies
+
+        # Handler masih jalan (reply lambat) saat SIGINT -> harus tetap selesai
+        api.slow_chats[DRAIN_CHAT_ID] = args.slow_reply
+        results['drain_status'] = post(webhook_url, make_update(args.updates + 2, DRAIN_CHAT_ID, '/status'))
+        time.sleep(0.2)
+        results['signal_at'] = time.perf_counter()
+    except Exception as e:
+        results['error'] = repr(e)
+    finally:
+        os.kill(os.getpid(), signal.SIGINT)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--updates', type=int, default=20, help="jumlah update /status yang di-POST")
+    parser.add_argument('--slow-reply', type=float, default=1.0, help="delay reply untuk cek drain saat shutdown")
+    parser.add_argument('--threshold', type=float, default=0.5, help="batas latency POST -> reply (detik)")
+    parser.add_argument('--verbose', action='store_true', help="tampilkan log bot")
+    args = parser.parse_args()
+
+    # Konfigurasi dibaca bot saat import
+    webhook_port, health_port = free_port(), free_port()
+    os.environ.update({
+        'TRACKER_DB_PATH': os.path.join(tempfile.mkdtemp(), 'webhook_harness.db'),
+        'TELEGRAM_WEBHOOK_URL': f"http://127.0.0.1:{webhook_port}",
+        'TELEGRAM_WEBHOOK_SECRET': SECRET,
+        'WEBHOOK_LISTEN': '127.0.0.1',
+        'PORT': str(webhook_port),
+        'HEALTH_PORT': str(health_port),
+    })
+    import bot
+    from fakes import FakeTwitter
+
+    if not args.verbose:
+        bot.logger.setLevel(logging.ERROR)
+        logging.getLogger('telegram').setLevel(logging.ERROR)
+
+    api = FakeBotAPI()
+    tracker = bot.TwitterFollowingTracker(
+        [{'name': 'cred1', 'bearer_token': 'fake'}], '1:fake',
+        client_factory=FakeTwitter().client_factory, telegram_request=api
+    )
+    results = {}
+    thread = threading.Thread(
+        target=client,
+        args=(args, api, f"http://127.0.0.1:{webhook_port}/{bot.WEBHOOK_PATH}",
+              f"http://127.0.0.1:{health_port}/health", results),
+        daemon=True
+    )
+    thread.start()
+    tracker.run()
+    stopped = time.perf_counter()
+    thread.join(5)
+
+    set_webhook = [params for endpoint, params in api.calls if endpoint == 'setWebhook']
+    latencies = sorted(results.get('latencies', []))
+    drained = wait_reply(api, DRAIN_CHAT_ID, timeout=0)
+    checks = {
+        'setWebhook dengan secret token': bool(set_webhook) and set_webhook[0].get('secret_token') == SECRET,
+        'secret salah ditolak (403)': results.get('wrong_secret') == 403,
+        f"{args.updates} update /status dibalas": len(latencies) == args.updates,
+        f"latency maks <= {args.threshold * 1000:.0f} ms": bool(latencies) and latencies[-1] <= args.threshold,
+        'handler in-flight selesai sebelum shutdown': drained is not None and drained <= stopped,
+    }
+
+    if 'error' in results:
+        print(f"client error: {results['error']}")
+    if set_webhook:
+        print(f"setWebhook: {set_webhook[0].get('url')}")
+    if latencies:
+        print(f"POST -> reply: p50 {latencies[len(latencies) // 2] * 1000:.1f} ms | maks {latencies[-1] * 1000:.1f} ms")
+    if 'signal_at' in results:
+        print(f"shutdown: {stopped - results['signal_at']:.2f}s setelah SIGINT (reply lambat {args.slow_reply}s)")
+    for name, ok in checks.items():
+        print(f"{'OK   ' if ok else 'GAGAL'} {name}")
+    return all(checks.values())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,9 +1,31 @@
 import tweepy
 import telegram
-from telegram.ext import Application, CommandHandler, ContextTypes, CallbackQueryHandler
+from telegram.error import RetryAfter
+from telegram.ext import Application, CommandHandler, ContextTypes, CallbackQueryHandler, MessageHandler, filters
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 import asyncio
+import bisect
+import contextvars
+import cProfile
+import csv
+import functools
+import heapq
+import io
+import itertools
+import json
+import math
+import multiprocessing
 import os
+import pstats
+import queue
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 import logging
 
@@ -14,6 +36,108 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Jumlah thread untuk request Twitter (tweepy blocking, jadi dijalankan di luar event loop)
+TWITTER_MAX_WORKERS = int(os.getenv("TWITTER_MAX_WORKERS", "4"))
+
+# Following list: endpoint return follow terbaru duluan, jadi cukup baca sampai
+# ketemu deretan ID yang sudah ada di snapshot. Full sync sesekali untuk rekonsiliasi.
+FOLLOWING_PAGE_SIZE = 1000
+INCREMENTAL_STOP_RUN = int(os.getenv("INCREMENTAL_STOP_RUN", "20"))
+FULL_SYNC_EVERY = int(os.getenv("FULL_SYNC_EVERY", "12"))  # tiap N cycle per akun
+
+# Users lookup menerima max 100 ID per request
+USERS_LOOKUP_BATCH = 100
+
+# Rate limit: nilai asli dibaca dari header x-rate-limit-*, ini hanya default
+# sebelum response pertama masuk (limit per window 15 menit)
+RATE_LIMIT_WINDOW = 900
+DEFAULT_RATE_LIMITS = {
+    '/2/users/:id/following': 15,
+    '/2/users': 300,
+    '/2/users/by': 300,
+    '/2/users/by/username/:username': 300,
+}
+MIN_CYCLE_SECONDS = int(os.getenv("MIN_CYCLE_SECONDS", "60"))
+
+# Polling adaptif: interval per akun ~ 1/sqrt(kecepatan follow), dibatasi min/max
+POLL_BASE_INTERVAL = int(os.getenv("POLL_BASE_INTERVAL", "600"))  # untuk 1 follow/jam
+POLL_MIN_INTERVAL = int(os.getenv("POLL_MIN_INTERVAL", "60"))
+POLL_MAX_INTERVAL = int(os.getenv("POLL_MAX_INTERVAL", "3600"))
+POLL_RATE_HALF_LIFE = 24 * 3600  # EWMA kecepatan follow
+POLL_RATE_FLOOR = 0.01  # follow/jam untuk akun dorman
+POLL_RATE_PRIOR = 1.0  # estimasi awal untuk akun baru
+POLL_RECENT_WINDOW = 2 * 3600  # boost kalau baru saja follow
+POLL_RECENT_BOOST = 2.0
+POLL_HIGH_PRIORITY_BOOST = 4.0
+
+# Pengiriman Telegram: worker paralel tapi tetap di bawah limit Telegram
+# (~30 pesan/detik global, 1 pesan/detik per chat, ~20 pesan/menit per grup)
+TELEGRAM_SEND_WORKERS = int(os.getenv("TELEGRAM_SEND_WORKERS", "8"))
+TELEGRAM_GLOBAL_RATE = 30
+TELEGRAM_CHAT_INTERVAL = 1.0
+TELEGRAM_GROUP_INTERVAL = 3.0
+TELEGRAM_MAX_ATTEMPTS = 3
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Lebih dari N follow baru per akun dalam satu cycle -> satu pesan digest
+DIGEST_THRESHOLD = int(os.getenv("DIGEST_THRESHOLD", "3"))
+
+# Cache profil user (ID & username) supaya enrichment tidak di-request ulang
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "5000"))
+PROFILE_CACHE_TTL = int(os.getenv("PROFILE_CACHE_TTL", "21600"))  # 6 jam
+PROFILE_FIELDS = ['name', 'username', 'public_metrics', 'description', 'created_at']
+
+# Konvergensi: minimal N akun dengan chain sama follow target yang sama dalam window
+CONVERGENCE_MIN = int(os.getenv("CONVERGENCE_MIN", "3"))
+CONVERGENCE_WINDOW = int(os.getenv("CONVERGENCE_WINDOW_HOURS", "24")) * 3600
+
+# /import: baseline following diproses antrian background (lewat rate limiter),
+# pesan progress di-edit paling sering tiap N detik
+BASELINE_WORKERS = int(os.getenv("BASELINE_WORKERS", "2"))
+IMPORT_PROGRESS_INTERVAL = 3
+# Sesi /add (menunggu pilihan chain) per pesan keyboard, hangus setelah N detik
+PENDING_ADD_TTL = int(os.getenv("PENDING_ADD_TTL", "600"))
+USERNAME_PATTERN = re.compile(r'^[A-Za-z0-9_]{1,15}$')
+
+# Credential yang dinonaktifkan (401, atau 403 yang lolos di credential lain) dicoba lagi
+# setelah cooldown; gagal lagi -> cooldown berlipat sampai maksimal
+CREDENTIAL_COOLDOWN = int(os.getenv("CREDENTIAL_COOLDOWN", "900"))
+CREDENTIAL_MAX_COOLDOWN = 6 * 3600
+
+# Mode sharded: >1 berarti coordinator (Telegram) + N proses worker monitoring
+TRACKER_SHARDS = int(os.getenv("TRACKER_SHARDS", "1"))
+# Field state akun yang dilaporkan worker ke coordinator setiap selesai cek
+SHARD_STATE_FIELDS = ['followers', 'following_count', 'cycles_since_full', 'last_check', 'follow_rate', 'last_follow']
+
+# Metrics (format teks Prometheus di /metrics health server) dan profiling cycle opsional
+METRICS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600, 21600)
+PROFILE_EVERY = int(os.getenv("PROFILE_EVERY", "0"))  # cProfile tiap N cycle, 0 = nonaktif
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+# Mode webhook: set TELEGRAM_WEBHOOK_URL (base URL publik https) untuk ganti long polling
+WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL")
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("PORT", "8443"))
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "telegram")
+WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET")
+
+# Health endpoint HTTP lokal (0 = nonaktif) dan batas waktu drain saat shutdown
+HEALTH_HOST = os.getenv("HEALTH_HOST", "127.0.0.1")
+HEALTH_PORT = int(os.getenv("HEALTH_PORT", "0"))
+SHUTDOWN_DRAIN_TIMEOUT = int(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "30"))
+
+# State persisten (SQLite WAL) supaya redeploy/crash tidak kehilangan tracking
+DB_PATH = os.getenv("TRACKER_DB_PATH", "tracker.db")
+
+# Log event follow/unfollow (append-only) untuk /history; event lebih lama dari
+# retensi dibuang dan halaman kosong dikembalikan ke disk tiap interval compaction
+EVENT_RETENTION_DAYS = int(os.getenv("EVENT_RETENTION_DAYS", "90"))
+EVENT_COMPACT_INTERVAL = int(os.getenv("EVENT_COMPACT_HOURS", "6")) * 3600
+EVENT_FOLLOW = 1
+EVENT_UNFOLLOW = -1
+HISTORY_DEFAULT_WINDOW = 24 * 3600
+HISTORY_LIMIT = 50
+
 # Chain configurations - Untuk label aja
 CHAINS = {
     'ETH': {'name': 'Ethereum', 'emoji': '⛓️'},
@@ -44,30 +168,1747 @@ CHAINS = {
     'MULTI': {'name': 'Multi-Chain', 'emoji': '🌐'}
 }
 
-class TwitterFollowingTracker:
-    def __init__(self, twitter_credentials, telegram_bot_token):
-        # Try using API keys first, fallback to bearer token
-        if all(k in twitter_credentials for k in ['api_key', 'api_secret', 'access_token', 'access_secret']):
-            self.twitter_client = tweepy.Client(
-                consumer_key=twitter_credentials['api_key'],
-                consumer_secret=twitter_credentials['api_secret'],
-                access_token=twitter_credentials['access_token'],
-                access_token_secret=twitter_credentials['access_secret']
-            )
-            logger.info("Using OAuth 1.0a authentication")
-        else:
-            self.twitter_client = tweepy.Client(bearer_token=twitter_credentials['bearer_token'])
-            logger.info("Using Bearer Token authentication")
+def endpoint_key(route):
+    """Normalisasi route API jadi key endpoint (ID/username diganti placeholder)"""
+    route = re.sub(r'^/2/users/by/username/[^/]+', '/2/users/by/username/:username', route)
+    return re.sub(r'^/2/users/\d+', '/2/users/:id', route)
+
+
+# Route per method tweepy yang dipakai bot
+TWITTER_ENDPOINTS = {
+    'get_user': '/2/users/by/username/:username',
+    'get_users': '/2/users',
+    'get_users_following': '/2/users/:id/following',
+}
+
+
+def method_endpoint(method, params):
+    """Endpoint key untuk call tweepy (get_users by username pakai route lain)"""
+    if method == 'get_users' and params.get('usernames'):
+        return '/2/users/by'
+    return TWITTER_ENDPOINTS[method]
+
+
+class PollingPriority:
+    """Interval polling adaptif per akun dari kecepatan follow (EWMA) dan flag prioritas
+    
+    Interval ~ 1/sqrt(rate): alokasi yang meminimalkan rata-rata delay deteksi
+    untuk total budget request yang sama.
+    """
+    
+    def __init__(self, base=POLL_BASE_INTERVAL, min_interval=POLL_MIN_INTERVAL,
+                 max_interval=POLL_MAX_INTERVAL, half_life=POLL_RATE_HALF_LIFE):
+        self.base = base
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.half_life = half_life
+    
+    def observe(self, data, new_follows, now):
+        """Update EWMA follow/jam dari hasil cek (panggil sebelum last_check diupdate)"""
+        dt = max(now - data['last_check'].timestamp(), 1)
+        alpha = 1 - math.exp(-dt / self.half_life)
+        observed = new_follows / (dt / 3600)
+        data['follow_rate'] = alpha * observed + (1 - alpha) * data.get('follow_rate', POLL_RATE_PRIOR)
+        if new_follows:
+            data['last_follow'] = now
+    
+    def interval(self, data, now):
+        weight = math.sqrt(max(data.get('follow_rate', POLL_RATE_PRIOR), POLL_RATE_FLOOR))
+        last_follow = data.get('last_follow')
+        if last_follow and now - last_follow < POLL_RECENT_WINDOW:
+            weight *= POLL_RECENT_BOOST
+        if data.get('priority') == 'high':
+            weight *= POLL_HIGH_PRIORITY_BOOST
+        return min(max(self.base / weight, self.min_interval), self.max_interval)
+    
+    def urgency(self, data, now):
+        """Rasio waktu sejak cek terakhir terhadap interval (>= 1 berarti sudah waktunya)"""
+        return (now - data['last_check'].timestamp()) / self.interval(data, now)
+    
+    def plan(self, accounts, metrics, now):
+        """Urutan cek satu cycle dari hasil pre-check semua akun
+        
+        following_count berubah -> selalu dicek (duluan); sisanya hanya kalau sudah
+        waktunya (full sync berkala). Tanpa data pre-check (gagal) -> jadwal saja.
+        """
+        planned = []
+        for username, data in accounts:
+            account_metrics = metrics.get(data['id'])
+            changed = account_metrics is not None and account_metrics['following_count'] != data['following_count']
+            urgency = self.urgency(data, now)
+            if changed or urgency >= 1:
+                planned.append((changed, urgency, username, data))
+        planned.sort(key=lambda x: (x[0], x[1]), reverse=True)
+        return [(username, data) for _, _, username, data in planned]
+
+
+class Metrics:
+    """Counter, histogram dan gauge in-process; dirender ke format teks Prometheus
+    
+    Histogram juga menyimpan 1000 observasi terakhir untuk ringkasan p50/p95 di /status.
+    Gauge berupa callback yang dihitung saat scrape.
+    """
+    
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+    
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+    
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0, 'recent': deque(maxlen=1000)}
+                self.histograms[key] = histogram
+            idx = bisect.bisect_left(self.buckets, value)
+            if idx < len(self.buckets):
+                histogram['counts'][idx] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+            histogram['recent'].append(value)
+    
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    def gauge(self, name, func, **labels):
+        self.gauges[self._key(name, labels)] = func
+    
+    def total(self, name, **match):
+        """Jumlah counter `name` untuk semua label yang cocok dengan `match`"""
+        with self._lock:
+            return sum(
+                value for (key, labels), value in self.counters.items()
+                if key == name and match.items() <= dict(labels).items()
+            )
+    
+    def summary(self, name, **match):
+        """count, sum, p50 dan p95 (dari observasi terakhir) untuk histogram `name`"""
+        with self._lock:
+            matched = [
+                histogram for (key, labels), histogram in self.histograms.items()
+                if key == name and match.items() <= dict(labels).items()
+            ]
+            recent = sorted(value for histogram in matched for value in histogram['recent'])
+            count = sum(histogram['count'] for histogram in matched)
+            total = sum(histogram['sum'] for histogram in matched)
+        if not recent:
+            return {'count': count, 'sum': total, 'p50': 0.0, 'p95': 0.0, 'last': 0.0}
+        return {
+            'count': count,
+            'sum': total,
+            'p50': recent[len(recent) // 2],
+            'p95': recent[max(0, int(len(recent) * 0.95) - 1)],
+            'last': matched[-1]['recent'][-1] if matched[-1]['recent'] else 0.0,
+        }
+    
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        escaped = []
+        for key, value in pairs:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            escaped.append(f'{key}="{value}"')
+        return '{' + ','.join(escaped) + '}'
+    
+    def render(self):
+        """Format teks Prometheus (version 0.0.4)"""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(
+                (key, dict(histogram, counts=list(histogram['counts']))) for key, histogram in self.histograms.items()
+            )
+        gauges = []
+        for key, func in sorted(self.gauges.items()):
+            try:
+                gauges.append((key, float(func())))
+            except Exception as e:
+                logger.debug(f"Gauge {key[0]} gagal: {e}")
+        
+        lines = []
+        typed = set()
+        
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+        
+        for (name, labels), value in counters:
+            declare(name, 'counter')
+            lines.append(f"{name}{self._labels(labels)} {value}")
+        for (name, labels), value in gauges:
+            declare(name, 'gauge')
+            lines.append(f"{name}{self._labels(labels)} {value}")
+        for (name, labels), histogram in histograms:
+            declare(name, 'histogram')
+            cumulative = 0
+            for bound, count in zip(self.buckets, histogram['counts']):
+                cumulative += count
+                lines.append(f"{name}_bucket{self._labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_bucket{self._labels(labels, [('le', '+Inf')])} {histogram['count']}")
+            lines.append(f"{name}_sum{self._labels(labels)} {histogram['sum']}")
+            lines.append(f"{name}_count{self._labels(labels)} {histogram['count']}")
+        return '\n'.join(lines) + '\n'
+
+
+class RateLimiter:
+    """Token bucket per (credential, endpoint) yang disinkronkan dari header rate limit"""
+    
+    def __init__(self, metrics=None):
+        self.buckets = {}
+        self.metrics = metrics or Metrics()
+        self._lock = threading.Lock()
+    
+    def _bucket(self, credential, endpoint):
+        key = (credential, endpoint)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            limit = DEFAULT_RATE_LIMITS.get(endpoint, 15)
+            bucket = {'limit': limit, 'remaining': limit, 'reset': time.time() + RATE_LIMIT_WINDOW}
+            self.buckets[key] = bucket
+        elif time.time() >= bucket['reset']:
+            # Window sudah reset, isi ulang token
+            bucket['remaining'] = bucket['limit']
+            bucket['reset'] = time.time() + RATE_LIMIT_WINDOW
+        return bucket
+    
+    def update(self, credential, endpoint, headers):
+        """Sinkronkan bucket dari header response/exception (dipanggil dari thread tweepy)"""
+        if 'x-rate-limit-remaining' not in headers or 'x-rate-limit-reset' not in headers:
+            return
+        with self._lock:
+            bucket = self._bucket(credential, endpoint)
+            if 'x-rate-limit-limit' in headers:
+                bucket['limit'] = int(headers['x-rate-limit-limit'])
+            bucket['remaining'] = int(headers['x-rate-limit-remaining'])
+            bucket['reset'] = int(headers['x-rate-limit-reset'])
+    
+    def exhaust(self, credential, endpoint, reset_time=None):
+        """Tandai bucket habis setelah 429"""
+        with self._lock:
+            bucket = self._bucket(credential, endpoint)
+            bucket['remaining'] = 0
+            if reset_time:
+                bucket['reset'] = reset_time
+    
+    def wait_time(self, credential, endpoint):
+        """Detik sampai ada token lagi (0 kalau bisa langsung)"""
+        with self._lock:
+            bucket = self._bucket(credential, endpoint)
+            if bucket['remaining'] > 0:
+                return 0
+            return max(0, bucket['reset'] - time.time()) + 1
+    
+    def remaining(self, credential, endpoint):
+        with self._lock:
+            bucket = self._bucket(credential, endpoint)
+            return bucket['remaining'], bucket['limit']
+    
+    async def acquire(self, credential, endpoint):
+        """Tunggu sampai budget tersedia lalu pakai satu token"""
+        started = time.monotonic()
+        while True:
+            delay = self.wait_time(credential, endpoint)
+            if delay <= 0:
+                break
+            logger.info(f"⏳ Budget {endpoint} habis, tunggu {delay:.0f}s sampai reset")
+            await asyncio.sleep(delay)
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            self.metrics.observe('twitter_rate_limit_wait_seconds', waited, endpoint=endpoint)
+        with self._lock:
+            self._bucket(credential, endpoint)['remaining'] -= 1
+    
+    def projected_seconds(self, credential, endpoint, requests):
+        """Estimasi waktu untuk menjalankan sejumlah request dengan budget sekarang"""
+        with self._lock:
+            bucket = self._bucket(credential, endpoint)
+            extra = requests - bucket['remaining']
+            if extra <= 0:
+                return 0
+            windows = math.ceil(extra / bucket['limit'])
+            first_wait = max(0, bucket['reset'] - time.time())
+            return first_wait + (windows - 1) * RATE_LIMIT_WINDOW
+
+
+class HeaderTrackingClient(tweepy.Client):
+    """tweepy.Client yang melaporkan header rate limit setiap response ke callback"""
+    
+    def __init__(self, *args, on_headers=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_headers = on_headers
+    
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        try:
+            response = super().request(method, route, params=params, json=json, user_auth=user_auth)
+        except tweepy.errors.HTTPException as e:
+            if self.on_headers:
+                self.on_headers(endpoint_key(route), e.response.headers)
+            raise
+        if self.on_headers:
+            self.on_headers(endpoint_key(route), response.headers)
+        return response
+
+
+class FollowingSnapshot:
+    """Snapshot following sebagai array int64 terurut
+    
+    Jauh lebih hemat memori dibanding set of int (8 byte vs ~60+ byte per ID).
+    Operasi `-`, `|` dan `in` dikerjakan dengan sorted-merge / bisect.
+    """
+    __slots__ = ('ids',)
+    
+    def __init__(self, ids=()):
+        self.ids = array('q', sorted(set(ids)))
+    
+    @property
+    def nbytes(self):
+        return self.ids.itemsize * len(self.ids)
+    
+    @classmethod
+    def from_sorted(cls, ids):
+        """Bungkus array yang sudah terurut dan unik tanpa sort ulang"""
+        snapshot = cls.__new__(cls)
+        snapshot.ids = ids if isinstance(ids, array) else array('q', ids)
+        return snapshot
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __bool__(self):
+        return len(self.ids) > 0
+    
+    def __iter__(self):
+        return iter(self.ids)
+    
+    def __contains__(self, user_id):
+        idx = bisect.bisect_left(self.ids, user_id)
+        return idx < len(self.ids) and self.ids[idx] == user_id
+    
+    def __eq__(self, other):
+        return isinstance(other, FollowingSnapshot) and self.ids == other.ids
+    
+    def __sub__(self, other):
+        if not isinstance(other, FollowingSnapshot):
+            other = FollowingSnapshot(other)
+        
+        # Sisi kiri jauh lebih kecil: bisect per elemen lebih murah dari merge
+        if len(self.ids) * 8 < len(other.ids):
+            return FollowingSnapshot.from_sorted(array('q', (x for x in self.ids if x not in other)))
+        
+        result = array('q')
+        theirs = other.ids
+        j = 0
+        n = len(theirs)
+        for x in self.ids:
+            while j < n and theirs[j] < x:
+                j += 1
+            if j == n or theirs[j] != x:
+                result.append(x)
+        return FollowingSnapshot.from_sorted(result)
+    
+    def __or__(self, other):
+        if not isinstance(other, FollowingSnapshot):
+            other = FollowingSnapshot(other)
+        new_ids = other - self
+        if not new_ids:
+            return FollowingSnapshot.from_sorted(array('q', self.ids))
+        # Dua run terurut: timsort cukup sekali merge
+        return FollowingSnapshot.from_sorted(array('q', sorted(self.ids + new_ids.ids)))
+
+
+class ProfileCache:
+    """Cache profil user dengan TTL + LRU, key user ID (bisa dicari lewat username)"""
+    
+    def __init__(self, maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.usernames = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, user_id):
+        entry = self.entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, user = entry
+        if expires < time.monotonic():
+            self._evict(user_id)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(user_id)
+        self.hits += 1
+        return user
+    
+    def peek(self, user_id):
+        """Profil tersimpan walau sudah expired, tanpa mengubah statistik/urutan LRU"""
+        entry = self.entries.get(user_id)
+        return entry[1] if entry else None
+    
+    def get_by_username(self, username):
+        user_id = self.usernames.get(username.lower())
+        if user_id is None:
+            self.misses += 1
+            return None
+        return self.get(user_id)
+    
+    def put(self, user):
+        if user.id in self.entries:
+            self._evict(user.id)
+        self.entries[user.id] = (time.monotonic() + self.ttl, user)
+        self.usernames[user.username.lower()] = user.id
+        while len(self.entries) > self.maxsize:
+            self._evict(next(iter(self.entries)))
+    
+    def _evict(self, user_id):
+        _, user = self.entries.pop(user_id)
+        if self.usernames.get(user.username.lower()) == user_id:
+            del self.usernames[user.username.lower()]
+    
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+class StateStore:
+    """Penyimpanan SQLite untuk tracked accounts, subscribers dan snapshot following"""
+    
+    def __init__(self, path):
+        # timeout: worker shard menulis ke file yang sama dari proses lain
+        self.conn = sqlite3.connect(path, timeout=30)
+        # Harus diset sebelum tabel pertama dibuat; DB lama dimigrasi di bawah (VACUUM sekali)
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS accounts (
+                username TEXT PRIMARY KEY,
+                id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                chain TEXT NOT NULL,
+                followers INTEGER NOT NULL DEFAULT 0,
+                following_count INTEGER NOT NULL DEFAULT 0,
+                cycles_since_full INTEGER NOT NULL DEFAULT 0,
+                last_check TEXT NOT NULL,
+                priority TEXT NOT NULL DEFAULT 'normal',
+                follow_rate REAL NOT NULL DEFAULT 1.0,
+                last_follow REAL
+            );
+            CREATE TABLE IF NOT EXISTS following (
+                account_id INTEGER NOT NULL,
+                target_id INTEGER NOT NULL,
+                PRIMARY KEY (account_id, target_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS subscribers (
+                chat_id INTEGER PRIMARY KEY,
+                chains TEXT,
+                accounts TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS follow_events (
+                id INTEGER PRIMARY KEY,
+                ts INTEGER NOT NULL,
+                account_id INTEGER NOT NULL,
+                target_id INTEGER NOT NULL,
+                kind INTEGER NOT NULL,
+                chain TEXT NOT NULL,
+                target_username TEXT
+            );
+            CREATE INDEX IF NOT EXISTS follow_events_account ON follow_events (account_id, ts);
+            CREATE INDEX IF NOT EXISTS follow_events_chain ON follow_events (chain, kind, ts);
+            CREATE INDEX IF NOT EXISTS follow_events_kind ON follow_events (kind, ts);
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY,
+                chat_id INTEGER NOT NULL,
+                text TEXT NOT NULL
+            );
+        """)
+        
+        # Migrasi DB lama: tambah kolom yang belum ada
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(accounts)")}
+        for column, definition in [
+            ('priority', "TEXT NOT NULL DEFAULT 'normal'"),
+            ('follow_rate', f"REAL NOT NULL DEFAULT {POLL_RATE_PRIOR}"),
+            ('last_follow', "REAL"),
+        ]:
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE accounts ADD COLUMN {column} {definition}")
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(subscribers)")}
+        for column in ('chains', 'accounts'):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE subscribers ADD COLUMN {column} TEXT")
+        self.conn.commit()
+        if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            logger.info("Migrasi DB ke auto_vacuum incremental (VACUUM sekali)")
+            self.conn.execute("VACUUM")
+    
+    def load_accounts(self, username=None):
+        """Load tracked accounts (semua, atau satu username) beserta snapshot following"""
+        accounts = {}
+        query = """SELECT username, id, name, chain, followers, following_count, cycles_since_full, last_check,
+                          priority, follow_rate, last_follow
+                   FROM accounts"""
+        if username is None:
+            rows = self.conn.execute(query).fetchall()
+        else:
+            rows = self.conn.execute(query + " WHERE username = ?", (username,)).fetchall()
+        for (username, account_id, name, chain, followers, following_count, cycles_since_full, last_check,
+             priority, follow_rate, last_follow) in rows:
+            following = FollowingSnapshot.from_sorted(array('q', (
+                row[0] for row in self.conn.execute(
+                    "SELECT target_id FROM following WHERE account_id = ? ORDER BY target_id", (account_id,)
+                )
+            )))
+            accounts[username] = {
+                'id': account_id,
+                'name': name,
+                'chain': chain,
+                'followers': followers,
+                'following_count': following_count,
+                'following_list': following,
+                'cycles_since_full': cycles_since_full,
+                'last_check': datetime.fromisoformat(last_check),
+                'priority': priority,
+                'follow_rate': follow_rate,
+                'last_follow': last_follow
+            }
+        return accounts
+    
+    def load_subscribers(self):
+        """chat_id -> filter langganan {'chains', 'accounts'}; None = semua alert"""
+        subscriptions = {}
+        for chat_id, chains, accounts in self.conn.execute("SELECT chat_id, chains, accounts FROM subscribers"):
+            if chains is None and accounts is None:
+                subscriptions[chat_id] = None
+            else:
+                subscriptions[chat_id] = {
+                    'chains': set(filter(None, (chains or '').split(','))),
+                    'accounts': set(filter(None, (accounts or '').split(','))),
+                }
+        return subscriptions
+    
+    def add_subscriber(self, chat_id):
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO subscribers (chat_id) VALUES (?)", (chat_id,))
+    
+    def set_subscription(self, chat_id, subscription):
+        chains = accounts = None
+        if subscription is not None:
+            chains = ','.join(sorted(subscription['chains']))
+            accounts = ','.join(sorted(subscription['accounts']))
+        with self.conn:
+            self.conn.execute(
+                """INSERT INTO subscribers (chat_id, chains, accounts) VALUES (?, ?, ?)
+                   ON CONFLICT(chat_id) DO UPDATE SET chains = excluded.chains, accounts = excluded.accounts""",
+                (chat_id, chains, accounts)
+            )
+    
+    def _write_account(self, username, data, insert=False):
+        """Tulis metadata akun; tanpa `insert` hanya update (akun yang sudah dihapus tidak hidup lagi)"""
+        if not insert:
+            return self.conn.execute(
+                """UPDATE accounts SET
+                       followers = ?, following_count = ?, cycles_since_full = ?, last_check = ?,
+                       priority = ?, follow_rate = ?, last_follow = ?
+                   WHERE username = ?""",
+                (
+                    data['followers'], data['following_count'], data.get('cycles_since_full', 0),
+                    data['last_check'].isoformat(), data.get('priority', 'normal'),
+                    data.get('follow_rate', POLL_RATE_PRIOR), data.get('last_follow'), username
+                )
+            ).rowcount
+        return self.conn.execute(
+            """INSERT INTO accounts (username, id, name, chain, followers, following_count, cycles_since_full, last_check,
+                                   priority, follow_rate, last_follow)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(username) DO UPDATE SET
+                   id = excluded.id, name = excluded.name, chain = excluded.chain,
+                   followers = excluded.followers, following_count = excluded.following_count,
+                   cycles_since_full = excluded.cycles_since_full, last_check = excluded.last_check,
+                   priority = excluded.priority, follow_rate = excluded.follow_rate,
+                   last_follow = excluded.last_follow""",
+            (
+                username, data['id'], data['name'], data['chain'], data['followers'],
+                data['following_count'], data.get('cycles_since_full', 0), data['last_check'].isoformat(),
+                data.get('priority', 'normal'), data.get('follow_rate', POLL_RATE_PRIOR), data.get('last_follow')
+            )
+        ).rowcount
+    
+    def save_account(self, username, data, following=None):
+        """Simpan metadata akun; kalau `following` diisi, akun baru/baseline dan snapshot diganti penuh"""
+        with self.conn:
+            self._write_account(username, data, insert=following is not None)
+            if following is not None:
+                self.conn.execute("DELETE FROM following WHERE account_id = ?", (data['id'],))
+                self.conn.executemany(
+                    "INSERT INTO following (account_id, target_id) VALUES (?, ?)",
+                    ((data['id'], target_id) for target_id in following)
+                )
+    
+    def apply_following_delta(self, username, data, added, removed, usernames=None, outbox=()):
+        """Tulis perubahan snapshot secara incremental + event follow/unfollow dalam satu transaksi
+        
+        `usernames` (target ID -> username) diisi kalau delta berasal dari snapshot yang sudah ada;
+        None berarti baseline, delta tidak dicatat sebagai event. `outbox` (chat_id, text) ikut
+        transaksi yang sama supaya notifikasinya tidak hilang kalau proses mati; return ID outbox.
+        """
+        with self.conn:
+            if not self._write_account(username, data):
+                return []
+            outbox_ids = self._insert_outbox(outbox)
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO following (account_id, target_id) VALUES (?, ?)",
+                ((data['id'], target_id) for target_id in added)
+            )
+            self.conn.executemany(
+                "DELETE FROM following WHERE account_id = ? AND target_id = ?",
+                ((data['id'], target_id) for target_id in removed)
+            )
+            if usernames is not None:
+                ts = int(time.time())
+                self.conn.executemany(
+                    """INSERT INTO follow_events (ts, account_id, target_id, kind, chain, target_username)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    [
+                        (ts, data['id'], target_id, EVENT_FOLLOW, data['chain'], usernames.get(target_id))
+                        for target_id in added
+                    ] + [
+                        (ts, data['id'], target_id, EVENT_UNFOLLOW, data['chain'], usernames.get(target_id))
+                        for target_id in removed
+                    ]
+                )
+        return outbox_ids
+    
+    def _insert_outbox(self, messages):
+        return [
+            self.conn.execute("INSERT INTO outbox (chat_id, text) VALUES (?, ?)", (chat_id, text)).lastrowid
+            for chat_id, text in messages
+        ]
+    
+    def add_outbox(self, messages):
+        with self.conn:
+            return self._insert_outbox(messages)
+    
+    def delete_outbox(self, outbox_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM outbox WHERE id = ?", (outbox_id,))
+    
+    def load_outbox(self):
+        """Pesan yang belum terkirim saat proses berhenti, urut seperti saat diantrikan"""
+        return self.conn.execute("SELECT id, chat_id, text FROM outbox ORDER BY id").fetchall()
+    
+    def query_events(self, since, account_id=None, chain=None, kind=None, limit=HISTORY_LIMIT):
+        """Event terbaru sejak `since` (unix detik), difilter akun / chain / jenis lewat index"""
+        clauses = ["ts >= ?"]
+        params = [int(since)]
+        for column, value in (('account_id', account_id), ('chain', chain), ('kind', kind)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return self.conn.execute(
+            f"""SELECT ts, account_id, target_id, kind, chain, target_username FROM follow_events
+                WHERE {' AND '.join(clauses)} ORDER BY ts DESC, id DESC LIMIT ?""",
+            params + [limit]
+        ).fetchall()
+    
+    def count_events(self, since, account_id=None, chain=None):
+        """Jumlah follow dan unfollow sejak `since`"""
+        clauses = ["ts >= ?"]
+        params = [int(since)]
+        for column, value in (('account_id', account_id), ('chain', chain)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        counts = dict(self.conn.execute(
+            f"SELECT kind, COUNT(*) FROM follow_events WHERE {' AND '.join(clauses)} GROUP BY kind", params
+        ).fetchall())
+        return counts.get(EVENT_FOLLOW, 0), counts.get(EVENT_UNFOLLOW, 0)
+    
+    def load_follow_window(self, since):
+        """Event follow/unfollow sejak `since` urut waktu, untuk membangun ulang window konvergensi"""
+        return self.conn.execute(
+            """SELECT ts, account_id, target_id, kind FROM follow_events
+               WHERE kind IN (?, ?) AND ts >= ? ORDER BY ts, id""",
+            (EVENT_FOLLOW, EVENT_UNFOLLOW, int(since))
+        ).fetchall()
+    
+    def compact_events(self, retention=EVENT_RETENTION_DAYS * 86400):
+        """Buang event di luar retensi lalu kembalikan halaman kosong ke disk; return jumlah terhapus"""
+        with self.conn:
+            deleted = self.conn.execute(
+                "DELETE FROM follow_events WHERE ts < ?", (int(time.time() - retention),)
+            ).rowcount
+        if deleted:
+            # execute() hanya menjalankan satu step pragma ini (satu halaman); executescript sampai selesai
+            self.conn.executescript("PRAGMA incremental_vacuum;")
+        return deleted
+    
+    def remove_account(self, username, account_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM accounts WHERE username = ?", (username,))
+            self.conn.execute("DELETE FROM following WHERE account_id = ?", (account_id,))
+            self.conn.execute("DELETE FROM follow_events WHERE account_id = ?", (account_id,))
+    
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+    
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, str(value))
+            )
+
+
+class DeliveryQueue:
+    """Antrian kirim Telegram dengan worker paralel, rate limit global/per chat dan RetryAfter
+    
+    Pesan diantrikan per chat; chat yang punya pesan ada di heap berdasarkan waktu siap
+    (interval chat / RetryAfter), jadi worker hanya mengambil chat yang sudah boleh dikirim
+    dan tidak pernah tidur menunggu satu chat yang lambat. Satu chat hanya dikirim oleh
+    satu worker sekaligus, urutan pesan per chat tetap.
+    
+    Dengan `store`, setiap pesan dicatat di tabel outbox sampai terkirim (at-least-once):
+    pesan yang tertinggal saat proses mati dikirim ulang di start() berikutnya.
+    """
+    
+    def __init__(self, bot, workers=TELEGRAM_SEND_WORKERS, metrics=None, store=None):
+        self.bot = bot
+        self.store = store
+        self.metrics = metrics or Metrics()
+        # Selama staging (lihat FollowingMonitor.check_account) enqueue hanya mengumpulkan pesan
+        self.staged = contextvars.ContextVar('delivery_staged', default=None)
+        self.worker_count = workers
+        self.workers = []
+        self.chats = {}  # chat_id -> deque (enqueued, text, outbox_id)
+        self.ready = []  # heap (waktu siap, seq, chat_id), satu entri per chat yang menunggu
+        self.ready_seq = itertools.count()
+        self.sending = set()
+        self.attempts = {}  # chat_id -> percobaan pesan terdepan
+        self.wakeup = asyncio.Event()
+        self.drained = asyncio.Event()
+        self.drained.set()
+        self.pending = 0
+        self.chat_next = {}
+        self.global_lock = asyncio.Lock()
+        self.global_next = 0.0
+        self.sent = 0
+        self.failed = 0
+        self.latencies = deque(maxlen=1000)
+    
+    def start(self):
+        if self.store:
+            restored = self.store.load_outbox()
+            if restored:
+                logger.info(f"📤 {len(restored)} pesan outbox dari sesi sebelumnya dikirim ulang")
+            for outbox_id, chat_id, text in restored:
+                self._put(chat_id, text, outbox_id)
+        for _ in range(self.worker_count):
+            self.workers.append(asyncio.create_task(self._worker()))
+    
+    async def stop(self, timeout=0):
+        # Kasih waktu antrian yang tersisa terkirim sebelum worker dihentikan
+        if timeout and self.workers:
+            try:
+                await asyncio.wait_for(self.drained.wait(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"{self.pending} pesan belum terkirim saat shutdown")
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+    
+    def enqueue(self, chat_id, text):
+        staged = self.staged.get()
+        if staged is not None:
+            staged.append((chat_id, text))
+            return
+        outbox_id = self.store.add_outbox([(chat_id, text)])[0] if self.store else None
+        self._put(chat_id, text, outbox_id)
+    
+    @contextmanager
+    def staging(self, staged):
+        """Tahan pesan yang diantrikan task ini di `staged`; dilepas lewat release() setelah disimpan"""
+        token = self.staged.set(staged)
+        try:
+            yield staged
+        finally:
+            self.staged.reset(token)
+    
+    def release(self, staged, outbox_ids):
+        for (chat_id, text), outbox_id in zip(staged, outbox_ids):
+            self._put(chat_id, text, outbox_id)
+    
+    def _put(self, chat_id, text, outbox_id):
+        messages = self.chats.get(chat_id)
+        if messages is None:
+            messages = self.chats[chat_id] = deque()
+        if not messages and chat_id not in self.sending:
+            self._schedule(chat_id)
+        messages.append((time.monotonic(), text, outbox_id))
+        self.pending += 1
+        self.drained.clear()
+    
+    def _schedule(self, chat_id):
+        heapq.heappush(self.ready, (self.chat_next.get(chat_id, 0.0), next(self.ready_seq), chat_id))
+        self.wakeup.set()
+    
+    async def _next_chat(self):
+        """Ambil chat berikutnya yang sudah siap; tunggu sampai ada (atau ada pesan baru)"""
+        while True:
+            delay = None
+            if self.ready:
+                delay = self.ready[0][0] - time.monotonic()
+                if delay <= 0:
+                    return heapq.heappop(self.ready)[2]
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _worker(self):
+        while True:
+            chat_id = await self._next_chat()
+            self.sending.add(chat_id)
+            messages = self.chats[chat_id]
+            enqueued, text, outbox_id = messages[0]
+            try:
+                done = await self._deliver(chat_id, text, enqueued)
+            except asyncio.CancelledError:
+                # Shutdown: pesan tetap di outbox, dikirim ulang setelah restart
+                self.sending.discard(chat_id)
+                raise
+            except Exception as e:
+                logger.error(f"Error kirim ke {chat_id}: {e}")
+                self.failed += 1
+                self.metrics.inc('telegram_messages_total', status='error')
+                done = True
+            
+            if done:
+                # Terkirim atau menyerah: keluar dari antrian dan outbox
+                messages.popleft()
+                self.attempts.pop(chat_id, None)
+                self.pending -= 1
+                if outbox_id is not None:
+                    self.store.delete_outbox(outbox_id)
+            self.sending.discard(chat_id)
+            if messages:
+                self._schedule(chat_id)
+            else:
+                del self.chats[chat_id]
+            if not self.pending:
+                self.drained.set()
+    
+    async def _wait_global(self):
+        async with self.global_lock:
+            now = time.monotonic()
+            if self.global_next > now:
+                await asyncio.sleep(self.global_next - now)
+            self.global_next = max(now, self.global_next) + 1 / TELEGRAM_GLOBAL_RATE
+    
+    async def _deliver(self, chat_id, text, enqueued):
+        """Satu percobaan kirim; return False kalau kena RetryAfter dan masih boleh dicoba lagi"""
+        # Chat grup/channel (ID negatif) punya limit lebih ketat
+        interval = TELEGRAM_GROUP_INTERVAL if chat_id < 0 else TELEGRAM_CHAT_INTERVAL
+        await self._wait_global()
+        self.chat_next[chat_id] = time.monotonic() + interval
+        try:
+            await self.bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                parse_mode='HTML',
+                disable_web_page_preview=False
+            )
+        except RetryAfter as e:
+            self.metrics.inc('telegram_messages_total', status='retry_after')
+            # Flood control: pause chat ini saja selama yang diminta Telegram
+            retry_after = float(e.retry_after)
+            logger.warning(f"Flood control, retry {chat_id} dalam {retry_after}s")
+            self.chat_next[chat_id] = max(self.chat_next[chat_id], time.monotonic() + retry_after)
+            self.attempts[chat_id] = self.attempts.get(chat_id, 0) + 1
+            if self.attempts[chat_id] < TELEGRAM_MAX_ATTEMPTS:
+                return False
+            self.failed += 1
+            self.metrics.inc('telegram_messages_total', status='failed')
+            logger.error(f"Gagal kirim ke {chat_id} setelah {TELEGRAM_MAX_ATTEMPTS} percobaan")
+            return True
+        self.sent += 1
+        self.latencies.append(time.monotonic() - enqueued)
+        self.metrics.inc('telegram_messages_total', status='sent')
+        self.metrics.observe('telegram_send_latency_seconds', time.monotonic() - enqueued)
+        return True
+    
+    def stats(self):
+        """Metrik antrian: depth, sent, failed, latency rata-rata dan p95 (detik)"""
+        latencies = sorted(self.latencies)
+        avg = sum(latencies) / len(latencies) if latencies else 0.0
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+        return {
+            'depth': self.pending,
+            'sent': self.sent,
+            'failed': self.failed,
+            'latency_avg': avg,
+            'latency_p95': p95,
+        }
+
+
+def build_twitter_client(credentials, on_headers):
+    """Buat client dari satu set credential (OAuth 1.0a atau bearer token)"""
+    # Try using API keys first, fallback to bearer token
+    if all(k in credentials for k in ['api_key', 'api_secret', 'access_token', 'access_secret']):
+        client = HeaderTrackingClient(
+            consumer_key=credentials['api_key'],
+            consumer_secret=credentials['api_secret'],
+            access_token=credentials['access_token'],
+            access_token_secret=credentials['access_secret'],
+            on_headers=on_headers
+        )
+        logger.info(f"[{credentials['name']}] Using OAuth 1.0a authentication")
+    else:
+        client = HeaderTrackingClient(
+            bearer_token=credentials['bearer_token'],
+            on_headers=on_headers
+        )
+        logger.info(f"[{credentials['name']}] Using Bearer Token authentication")
+    return client
+
+
+class CredentialPool:
+    """Beberapa credential Twitter yang dirotasi berdasarkan sisa quota dan kesehatan"""
+    
+    def __init__(self, credentials, rate_limiter, client_factory=None):
+        client_factory = client_factory or build_twitter_client
+        self.rate_limiter = rate_limiter
+        self.clients = {}
+        self.disabled = {}  # name -> (alasan, monotonic waktu boleh dicoba lagi)
+        self.strikes = {}
+        self.errors = {}
+        for idx, cred in enumerate(credentials):
+            name = cred.get('name') or f"cred{idx + 1}"
+            cred = dict(cred, name=name)
+            on_headers = functools.partial(rate_limiter.update, name)
+            self.clients[name] = client_factory(cred, on_headers)
+            self.errors[name] = 0
+    
+    def healthy(self):
+        now = time.monotonic()
+        for name, (reason, retry_at) in list(self.disabled.items()):
+            if retry_at <= now:
+                # Request berikutnya jadi probe: sukses -> strike direset, gagal -> cooldown lebih lama
+                del self.disabled[name]
+                logger.info(f"🔑 Credential {name} dicoba lagi setelah cooldown ({reason})")
+        return [name for name in self.clients if name not in self.disabled]
+    
+    def select(self, endpoint, exclude=None):
+        """Credential sehat dengan waktu tunggu terkecil, lalu sisa quota terbanyak"""
+        names = [name for name in self.healthy() if name != exclude]
+        if not names:
+            return None, None
+        name = min(
+            names,
+            key=lambda n: (
+                self.rate_limiter.wait_time(n, endpoint),
+                -self.rate_limiter.remaining(n, endpoint)[0]
+            )
+        )
+        return name, self.clients[name]
+    
+    def disable(self, name, reason):
+        """Keluarkan credential dari rotasi sampai cooldown habis"""
+        self.strikes[name] = self.strikes.get(name, 0) + 1
+        cooldown = min(CREDENTIAL_COOLDOWN * 2 ** (self.strikes[name] - 1), CREDENTIAL_MAX_COOLDOWN)
+        self.disabled[name] = (reason, time.monotonic() + cooldown)
+        logger.error(f"🔑 Credential {name} dinonaktifkan {cooldown}s: {reason}")
+    
+    def succeeded(self, name):
+        self.errors[name] = 0
+        self.strikes.pop(name, None)
+    
+    def wait_time(self, endpoint):
+        names = self.healthy()
+        return min((self.rate_limiter.wait_time(n, endpoint) for n in names), default=0)
+    
+    def remaining(self, endpoint):
+        """Total (remaining, limit) semua credential sehat"""
+        totals = [self.rate_limiter.remaining(n, endpoint) for n in self.healthy()]
+        return sum(r for r, _ in totals), sum(l for _, l in totals)
+    
+    def projected_seconds(self, endpoint, requests):
+        """Estimasi waktu kalau request dibagi rata ke semua credential sehat"""
+        names = self.healthy()
+        if not names:
+            return 0
+        per_credential = math.ceil(requests / len(names))
+        return max(self.rate_limiter.projected_seconds(n, endpoint, per_credential) for n in names)
+
+
+def load_extra_twitter_credentials():
+    """Credential tambahan untuk pool: TWITTER_CREDENTIALS_FILE (JSON list) dan TWITTER_BEARER_TOKEN_2..N"""
+    credentials = []
+    
+    path = os.getenv("TWITTER_CREDENTIALS_FILE")
+    if path:
+        with open(path) as f:
+            for idx, cred in enumerate(json.load(f)):
+                credentials.append(dict(cred, name=cred.get('name') or f"file{idx + 1}"))
+    
+    idx = 2
+    while os.getenv(f"TWITTER_BEARER_TOKEN_{idx}"):
+        credentials.append({'name': f"bearer{idx}", 'bearer_token': os.getenv(f"TWITTER_BEARER_TOKEN_{idx}")})
+        idx += 1
+    
+    return credentials
+
+
+class FollowingMonitor:
+    """Bagian Twitter dari tracker: credential pool, rate limit, fetch dan deteksi follow
+    
+    Dipakai langsung oleh TwitterFollowingTracker (mode satu proses) dan oleh
+    ShardWorker (mode sharded). Subclass mengisi hook on_following_delta,
+    on_account_checked dan notify_system.
+    """
+    
+    def __init__(self, twitter_credentials, store, client_factory=None):
+        self.metrics = Metrics()
+        self.rate_limiter = RateLimiter(self.metrics)
+        self.priority = PollingPriority()
+        self.cycles = 0
+        # DeliveryQueue yang notifikasi delta-nya disimpan satu transaksi dengan snapshot
+        self.outbox = None
+        
+        # Satu dict (credential tunggal) atau list untuk credential pool
+        if isinstance(twitter_credentials, dict):
+            twitter_credentials = [dict(twitter_credentials, name=twitter_credentials.get('name', 'default'))]
+        self.twitter_credentials = twitter_credentials
+        # client_factory(credentials, on_headers) bisa diganti backend palsu (benchmarks/)
+        self.pool = CredentialPool(twitter_credentials, self.rate_limiter, client_factory)
+        logger.info(f"Credential pool: {len(self.pool.clients)} credential")
+        
+        # Thread pool terbatas untuk semua call tweepy
+        self.twitter_executor = ThreadPoolExecutor(
+            max_workers=TWITTER_MAX_WORKERS,
+            thread_name_prefix='twitter'
+        )
+        
+        # Warm restart: lanjut dari snapshot tersimpan tanpa fetch baseline ulang
+        self.store = store
+        self.tracked_accounts = self.store.load_accounts()
+        self.profiles = ProfileCache()
+        
+        # Satu handle task monitoring; start/stop lewat lock supaya tidak pernah ada dua loop
+        self.monitoring = False
+        self.monitoring_task = None
+        self.monitoring_lock = asyncio.Lock()
+    
+    async def twitter_call(self, method, **kwargs):
+        """Jalankan method tweepy.Client di thread pool tanpa block event loop
+        
+        Credential dipilih dari pool (quota terbanyak), lalu tunggu token dari
+        rate limiter untuk endpoint tersebut. Unauthorized = masalah credential,
+        langsung dikeluarkan dari rotasi. Forbidden bisa juga masalah target
+        (akun protected/suspended), jadi diulang sekali di credential lain:
+        credential pertama baru dinonaktifkan kalau credential kedua berhasil.
+        """
+        endpoint = method_endpoint(method, kwargs)
+        loop = asyncio.get_running_loop()
+        forbidden = None
+        
+        while True:
+            name, client = self.pool.select(endpoint, exclude=forbidden and forbidden[0])
+            if client is None:
+                if forbidden:
+                    raise forbidden[1]
+                raise tweepy.errors.TweepyException("Semua credential Twitter nonaktif")
+            
+            await self.rate_limiter.acquire(name, endpoint)
+            func = functools.partial(getattr(client, method), **kwargs)
+            started = time.perf_counter()
+            status = 'ok'
+            try:
+                result = await loop.run_in_executor(self.twitter_executor, func)
+                self.pool.succeeded(name)
+                if forbidden:
+                    self.pool.disable(forbidden[0], str(forbidden[1]))
+                return result
+            except tweepy.errors.TooManyRequests as e:
+                # Header 429 kadang tidak lengkap, pastikan bucket ditandai habis
+                status = 'rate_limited'
+                self.rate_limiter.exhaust(name, endpoint, e.reset_time)
+                raise
+            except tweepy.errors.Unauthorized as e:
+                status = 'unauthorized'
+                self.pool.disable(name, str(e))
+                if not self.pool.healthy():
+                    raise
+            except tweepy.errors.Forbidden as e:
+                status = 'forbidden'
+                # 403 di credential kedua juga -> masalah request, bukan credential
+                if forbidden:
+                    raise
+                forbidden = (name, e)
+            except tweepy.errors.HTTPException:
+                status = 'error'
+                self.pool.errors[name] += 1
+                raise
+            finally:
+                self.metrics.inc('twitter_api_requests_total', endpoint=endpoint, status=status)
+                self.metrics.observe('twitter_api_request_seconds', time.perf_counter() - started, endpoint=endpoint)
+    
+    async def get_profiles(self, user_ids):
+        """Profil lengkap (PROFILE_FIELDS) per user ID; hanya yang belum di-cache yang di-request"""
+        profiles = {}
+        missing = []
+        for user_id in user_ids:
+            user = self.profiles.get(user_id)
+            if user:
+                profiles[user_id] = user
+            else:
+                missing.append(user_id)
+        
+        for i in range(0, len(missing), USERS_LOOKUP_BATCH):
+            response = await self.twitter_call(
+                'get_users',
+                ids=missing[i:i + USERS_LOOKUP_BATCH],
+                user_fields=PROFILE_FIELDS
+            )
+            for user in response.data or []:
+                self.profiles.put(user)
+                profiles[user.id] = user
+        return profiles
+    
+    async def resolve_usernames(self, usernames):
+        """Profil per username (key lowercase); yang belum di-cache di-lookup per 100 username"""
+        profiles = {}
+        missing = []
+        for username in usernames:
+            user = self.profiles.get_by_username(username)
+            if user:
+                profiles[username.lower()] = user
+            else:
+                missing.append(username)
+        
+        for i in range(0, len(missing), USERS_LOOKUP_BATCH):
+            response = await self.twitter_call(
+                'get_users',
+                usernames=missing[i:i + USERS_LOOKUP_BATCH],
+                user_fields=PROFILE_FIELDS
+            )
+            for user in response.data or []:
+                self.profiles.put(user)
+                profiles[user.username.lower()] = user
+        return profiles
+    
+    async def fetch_following(self, user_id, user_fields=None, known=None):
+        """Ambil following list dengan pagination (next_token)
+        
+        Kalau `known` diisi (mode incremental), berhenti setelah ketemu
+        INCREMENTAL_STOP_RUN ID berturut-turut yang sudah ada di snapshot.
+        Return (users, complete) - complete=True kalau semua halaman terbaca.
+        """
+        users = []
+        known_run = 0
+        pagination_token = None
+        
+        while True:
+            params = {
+                'id': user_id,
+                'max_results': FOLLOWING_PAGE_SIZE
+            }
+            if user_fields:
+                params['user_fields'] = user_fields
+            if pagination_token:
+                params['pagination_token'] = pagination_token
+            
+            page = await self.twitter_call('get_users_following', **params)
+            
+            for user in page.data or []:
+                if known is not None and user.id in known:
+                    known_run += 1
+                    if known_run >= INCREMENTAL_STOP_RUN:
+                        return users, False
+                else:
+                    known_run = 0
+                users.append(user)
+            
+            pagination_token = (page.meta or {}).get('next_token')
+            if not pagination_token:
+                return users, True
+    
+    async def precheck_metrics(self, accounts):
+        """Batched users lookup untuk public_metrics semua akun -> {user_id: public_metrics}"""
+        ids = [data['id'] for data in accounts]
+        metrics = {}
+        for i in range(0, len(ids), USERS_LOOKUP_BATCH):
+            response = await self.twitter_call(
+                'get_users',
+                ids=ids[i:i + USERS_LOOKUP_BATCH],
+                user_fields=['public_metrics']
+            )
+            for user in response.data or []:
+                metrics[user.id] = user.public_metrics
+        return metrics
+    
+    async def check_following(self):
+        """Pre-check semua akun tiap cycle; endpoint following hanya untuk akun yang berubah/waktunya"""
+        # Salin dulu: handler lain bisa ubah tracked_accounts selama await
+        accounts = list(self.tracked_accounts.items())
+        if not accounts:
+            return
+        
+        # Pre-check murah (1 request per 100 akun): following_count berubah -> fetch following
+        try:
+            with self.metrics.timer('check_phase_seconds', phase='precheck'):
+                metrics = await self.precheck_metrics([data for _, data in accounts])
+        except Exception as e:
+            logger.warning(f"Pre-check gagal, cek akun yang sudah waktunya: {e}")
+            metrics = {}
+        
+        for _, data in accounts:
+            if data['id'] in metrics:
+                data['followers'] = metrics[data['id']]['followers_count']
+        
+        # Prioritas adaptif hanya menentukan jatah endpoint following yang terbatas
+        for username, data in self.priority.plan(accounts, metrics, time.time()):
+            # /remove (atau add ulang) di tengah cycle: akun ini tidak dicek lagi
+            if self.tracked_accounts.get(username) is not data:
+                continue
+            try:
+                with self.metrics.timer('check_account_seconds'):
+                    await self.check_account(username, data, metrics.get(data['id']))
+            except tweepy.errors.TooManyRequests as e:
+                # Tidak perlu sleep di sini: request berikutnya menunggu reset lewat rate limiter
+                wait = self.pool.wait_time(TWITTER_ENDPOINTS['get_users_following'])
+                logger.warning(f"⚠️ Rate limit hit! Reset dalam {wait:.0f}s")
+                await self.notify_system(
+                    f"⚠️ <b>Rate Limit Twitter API</b>\n\nBot pause ~{math.ceil(wait / 60)} menit sampai limit reset"
+                )
+            except (tweepy.errors.Forbidden, tweepy.errors.Unauthorized) as e:
+                if not self.pool.healthy():
+                    # Semua credential nonaktif -> masalah token/akses, bukan akun ini
+                    logger.error(f"❌ Semua credential ditolak: {e}")
+                    await self.notify_system(f"❌ <b>Twitter API Error</b>\n\nCek Bearer Token atau akses API")
+                    break
+                # 403 level request (akun protected/suspended): lewati akun ini saja
+                logger.warning(f"⚠️ @{username} tidak bisa dibaca (403), dilewati: {e}")
+                await self.skip_account(username, data, metrics.get(data['id']))
+            except Exception as e:
+                logger.error(f"Error cek @{username}: {e}")
+                await asyncio.sleep(10)
+    
+    async def skip_account(self, username, data, account_metrics):
+        """Akun yang ditolak (403) dianggap sudah dicek: count dari pre-check dipakai supaya
+        akun tidak terus terlihat berubah dan menghabiskan budget following tiap cycle"""
+        if account_metrics:
+            data['following_count'] = account_metrics['following_count']
+        data['last_check'] = datetime.now()
+        if self.tracked_accounts.get(username) is data:
+            self.store.save_account(username, data)
+        self.metrics.inc('accounts_checked_total', result='forbidden')
+        await self.on_account_checked(username, data)
+    
+    async def check_account(self, username, data, account_metrics):
+        """Cek satu akun; state disimpan per akun jadi cycle aman di-cancel di antara akun"""
+        if account_metrics:
+            data['followers'] = account_metrics['followers_count']
+            
+            if (
+                account_metrics['following_count'] == data['following_count']
+                and data.get('cycles_since_full', 0) < FULL_SYNC_EVERY
+            ):
+                # Full sync tetap jalan berkala (follow + unfollow bisa bikin count sama)
+                data['cycles_since_full'] = data.get('cycles_since_full', 0) + 1
+                self.priority.observe(data, 0, time.time())
+                data['last_check'] = datetime.now()
+                if self.tracked_accounts.get(username) is data:
+                    self.store.save_account(username, data)
+                self.metrics.inc('accounts_checked_total', result='unchanged')
+                await self.on_account_checked(username, data)
+                return
+        
+        logger.info(f"Checking @{username}...")
+        
+        # Incremental kecuali snapshot kosong atau sudah waktunya full sync
+        full_sync = (
+            not data['following_list']
+            or data.get('cycles_since_full', 0) >= FULL_SYNC_EVERY
+        )
+        
+        # Get current following list (field default saja, enrichment lewat profile cache)
+        with self.metrics.timer('check_phase_seconds', phase='fetch'):
+            following, complete = await self.fetch_following(
+                data['id'],
+                known=None if full_sync else data['following_list']
+            )
+        self.metrics.inc('accounts_checked_total', result='full' if full_sync else 'incremental')
+        
+        if not following:
+            # Following 0 atau tidak terbaca (protected): tetap tercatat sudah dicek supaya
+            # tidak terus terlihat berubah; snapshot lama dibiarkan (bukan berarti unfollow semua)
+            self.priority.observe(data, 0, time.time())
+            if account_metrics:
+                data['following_count'] = account_metrics['following_count']
+            data['cycles_since_full'] = 0 if complete else data.get('cycles_since_full', 0) + 1
+            data['last_check'] = datetime.now()
+            if self.tracked_accounts.get(username) is data:
+                self.store.save_account(username, data)
+            await self.on_account_checked(username, data)
+            return
+        
+        fetched = FollowingSnapshot(user.id for user in following)
+        if complete:
+            # Semua halaman terbaca -> snapshot lengkap (unfollow ikut terbuang)
+            current_following = fetched
+            data['cycles_since_full'] = 0
+        else:
+            current_following = data['following_list'] | fetched
+            data['cycles_since_full'] = data.get('cycles_since_full', 0) + 1
+        
+        added = current_following - data['following_list']
+        removed = data['following_list'] - current_following
+        # Delta dari snapshot kosong = baseline, tidak masuk log event
+        usernames = None
+        if data['following_list']:
+            usernames = {user.id: user.username for user in following if user.id in added}
+            for target_id in removed:
+                cached = self.profiles.peek(target_id)
+                if cached:
+                    usernames[target_id] = cached.username
+            if removed:
+                self.metrics.inc('unfollows_detected_total', len(removed), chain=data.get('chain', ''))
+        
+        # Detect new follows
+        new_users = []
+        if data['following_list'] and added:
+            logger.info(f"Found {len(added)} new follows for @{username}")
+            # Batas atas jarak follow -> terdeteksi: follow terjadi setelah cek terakhir
+            if data.get('last_check'):
+                gap = (datetime.now() - data['last_check']).total_seconds()
+                self.metrics.observe('follow_detection_gap_seconds', gap, chain=data.get('chain', ''))
+            self.metrics.inc('follows_detected_total', len(added), chain=data.get('chain', ''))
+            try:
+                with self.metrics.timer('check_phase_seconds', phase='enrich'):
+                    profiles = await self.get_profiles(list(added))
+            except Exception as e:
+                logger.warning(f"Enrichment profil gagal: {e}")
+                profiles = {}
+            new_users = [profiles.get(user.id, user) for user in following if user.id in added]
+        
+        # Notifikasi ditahan sampai delta tersimpan: crash di antaranya tidak menghilangkan
+        # alert (follow yang sudah tercatat di snapshot tidak akan terdeteksi lagi)
+        staged = []
+        if self.tracked_accounts.get(username) is data and (added or removed):
+            with self.metrics.timer('check_phase_seconds', phase='notify'), self.stage_notifications(staged):
+                await self.on_following_delta(username, data, added, removed, new_users)
+        
+        # Update following list (ke DB hanya delta-nya)
+        self.priority.observe(data, len(added) if data['following_list'] else 0, time.time())
+        data['following_list'] = current_following
+        data['following_count'] = (
+            account_metrics['following_count'] if account_metrics else len(current_following)
+        )
+        data['last_check'] = datetime.now()
+        if self.tracked_accounts.get(username) is data:
+            with self.metrics.timer('check_phase_seconds', phase='store'):
+                outbox_ids = self.store.apply_following_delta(
+                    username, data, added, removed, usernames, outbox=staged
+                )
+            if self.outbox:
+                self.outbox.release(staged, outbox_ids)
+        await self.on_account_checked(username, data)
+    
+    def projected_cycle_seconds(self):
+        """Estimasi durasi satu cycle dari budget rate limit yang tersisa"""
+        accounts_count = len(self.tracked_accounts)
+        lookup_requests = math.ceil(accounts_count / USERS_LOOKUP_BATCH)
+        # Worst case: semua akun berubah dan butuh fetch following
+        following = self.pool.projected_seconds(TWITTER_ENDPOINTS['get_users_following'], accounts_count)
+        lookup = self.pool.projected_seconds(TWITTER_ENDPOINTS['get_users'], lookup_requests)
+        return max(following, lookup, MIN_CYCLE_SECONDS)
+    
+    async def start_monitoring(self):
+        """Jalankan task monitoring; return False kalau sudah jalan"""
+        async with self.monitoring_lock:
+            self.monitoring = True
+            if self.monitoring_task and not self.monitoring_task.done():
+                return False
+            self.monitoring_task = asyncio.create_task(self.monitoring_loop())
+            return True
+    
+    async def stop_monitoring(self):
+        """Cancel task monitoring dan tunggu sampai benar-benar berhenti"""
+        async with self.monitoring_lock:
+            self.monitoring = False
+            task, self.monitoring_task = self.monitoring_task, None
+            if task and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+    
+    async def monitoring_loop(self):
+        """Loop monitoring; berhenti lewat cancel (bisa di tengah sleep rate limit)"""
+        logger.info("Monitoring dimulai")
+        try:
+            while True:
+                started = time.monotonic()
+                self.cycles += 1
+                if PROFILE_EVERY and self.cycles % PROFILE_EVERY == 0:
+                    await self.profiled_cycle()
+                else:
+                    await self.monitoring_cycle()
+                self.metrics.observe('monitor_cycle_seconds', time.monotonic() - started)
+                # Kalau semua akun di-skip oleh pre-check, jangan spam users lookup
+                await asyncio.sleep(max(0, MIN_CYCLE_SECONDS - (time.monotonic() - started)))
+        finally:
+            logger.info("Monitoring berhenti")
+    
+    async def monitoring_cycle(self):
+        await self.check_following()
+    
+    async def profiled_cycle(self):
+        """Satu cycle di bawah cProfile; hasil ke PROFILE_DIR (buka dengan pstats / snakeviz)"""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.monitoring_cycle()
+        finally:
+            profiler.disable()
+            try:
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                path = os.path.join(PROFILE_DIR, f"cycle-{os.getpid()}-{self.cycles}.prof")
+                profiler.dump_stats(path)
+                output = io.StringIO()
+                pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(15)
+                logger.info(f"Profil cycle #{self.cycles} disimpan ke {path}\n{output.getvalue()}")
+            except OSError as e:
+                logger.warning(f"Gagal simpan profil cycle: {e}")
+    
+    def stage_notifications(self, staged):
+        return self.outbox.staging(staged) if self.outbox else nullcontext()
+    
+    async def on_following_delta(self, username, data, added, removed, new_users):
+        """Hook: snapshot akun berubah (new_users = follow baru yang perlu dinotifikasi)"""
+    
+    async def on_account_checked(self, username, data):
+        """Hook: akun selesai dicek (state sudah diupdate)"""
+    
+    async def notify_system(self, message):
+        """Hook: pesan sistem (rate limit, error API)"""
+        logger.warning(message)
+
+
+def parse_account_list(text, default_chain=None):
+    """Parse daftar akun (teks tempel / CSV / JSON) -> (entries, invalid)
+    
+    entries: list (username, chain, priority); invalid: baris yang ditolak.
+    """
+    text = text.strip()
+    rows = []
+    invalid = []
+    if text.startswith(('[', '{')):
+        items = json.loads(text)
+        if isinstance(items, dict):
+            items = items.get('accounts', [])
+        if not isinstance(items, list):
+            invalid.append(json.dumps(items))
+            items = []
+        for item in items:
+            if isinstance(item, dict):
+                rows.append([str(item.get(key) or '') for key in ('username', 'chain', 'priority')])
+            elif isinstance(item, str):
+                rows.append([item])
+            elif isinstance(item, list):
+                rows.append([str(value) for value in item])
+            else:
+                invalid.append(json.dumps(item))
+    else:
+        for row in csv.reader(io.StringIO(text)):
+            # Tempel manual boleh pakai spasi: "@lookonchain ETH"
+            if len(row) == 1:
+                row = row[0].split()
+            rows.append(row)
+    
+    entries = []
+    seen = set()
+    for row in rows:
+        fields = [value.strip() for value in row]
+        if not fields or not fields[0] or fields[0].lower() == 'username':
+            continue
+        username = fields[0].lstrip('@')
+        chain = (fields[1] if len(fields) > 1 and fields[1] else default_chain or '').upper()
+        priority = fields[2].lower() if len(fields) > 2 and fields[2] else None
+        if not USERNAME_PATTERN.match(username) or chain not in CHAINS or priority not in (None, 'high', 'normal'):
+            invalid.append(','.join(fields))
+            continue
+        if username.lower() in seen:
+            continue
+        seen.add(username.lower())
+        entries.append((username, chain, priority))
+    return entries, invalid
+
+
+def shard_for(account_id, shards):
+    """Partisi hash: akun selalu jatuh ke shard yang sama selama jumlah shard tetap"""
+    return account_id % shards
+
+
+def shard_count(credentials, requested):
+    """Jumlah worker yang benar-benar dijalankan: maksimal satu per credential
+    
+    RateLimiter ada per proses dan tidak tahu budget yang dipakai proses lain, jadi
+    satu credential di dua worker = quota terpakai dobel dan 429 beruntun.
+    """
+    if requested > len(credentials):
+        logger.warning(
+            f"TRACKER_SHARDS={requested} tapi hanya {len(credentials)} credential Twitter, "
+            f"dibatasi jadi {max(len(credentials), 1)} (tiap worker butuh credential sendiri)"
+        )
+        return max(len(credentials), 1)
+    return requested
+
+
+def credentials_for_shard(credentials, shard_id, shards):
+    """Bagi credential ke worker dan coordinator (shard_id None); shards <= jumlah credential
+    
+    Tiap worker dapat credential sendiri (tidak ada yang dipakai dua worker). Credential
+    lebih banyak dari jumlah shard -> coordinator juga dapat bagian sendiri untuk lookup
+    user (/add, /import); kalau tidak, coordinator ikut memakai semua credential tapi hanya
+    untuk lookup user, karena endpoint following hanya dipakai worker (baseline dikerjakan
+    shard pemilik akun).
+    """
+    slots = shards + 1 if len(credentials) > shards else shards
+    if shard_id is None:
+        return credentials[shards::slots] if slots > shards else credentials
+    return credentials[shard_id::slots]
+
+
+class ShardWorker(FollowingMonitor):
+    """Proses worker: pantau subset tracked_accounts (partisi hash) dan lapor ke coordinator
+    
+    Snapshot ditulis langsung ke DB bersama, jadi akun bisa pindah shard
+    (restart dengan jumlah shard berbeda) tanpa kehilangan state.
+    """
+    
+    def __init__(self, shard_id, shards, twitter_credentials, commands, events):
+        super().__init__(twitter_credentials, StateStore(DB_PATH))
+        self.shard_id = shard_id
+        self.tracked_accounts = {
+            username: data for username, data in self.tracked_accounts.items()
+            if shard_for(data['id'], shards) == shard_id
+        }
+        self.commands = commands
+        self.events = events
+        self.running = True
+        self.baseline_requests = set()
+    
+    async def on_following_delta(self, username, data, added, removed, new_users):
+        self.events.put(('delta', username, list(added), list(removed), [user.data for user in new_users]))
+    
+    async def on_account_checked(self, username, data):
+        self.events.put(('checked', username, {field: data.get(field) for field in SHARD_STATE_FIELDS}))
+    
+    async def notify_system(self, message):
+        self.events.put(('system', message))
+    
+    async def send_baseline(self, request_id, account_id):
+        """Baseline untuk /add di coordinator, pakai budget following shard ini"""
+        try:
+            following, _ = await self.fetch_following(account_id)
+            self.events.put(('baseline', request_id, [user.id for user in following], None))
+        except Exception as e:
+            self.events.put(('baseline', request_id, None, str(e)))
+    
+    async def handle_command(self, command):
+        kind = command[0]
+        if kind == 'add':
+            # Baseline sudah disimpan coordinator, cukup load dari DB
+            self.tracked_accounts.update(self.store.load_accounts(command[1]))
+        elif kind == 'remove':
+            self.tracked_accounts.pop(command[1], None)
+        elif kind == 'update':
+            data = self.tracked_accounts.get(command[1])
+            if data:
+                data.update(command[2])
+        elif kind == 'baseline':
+            # Task terpisah supaya command lain tidak antri di belakang fetch baseline
+            task = asyncio.create_task(self.send_baseline(command[1], command[2]))
+            self.baseline_requests.add(task)
+            task.add_done_callback(self.baseline_requests.discard)
+        elif kind == 'monitor':
+            if command[1]:
+                await self.start_monitoring()
+            else:
+                await self.stop_monitoring()
+        elif kind == 'stop':
+            self.running = False
+    
+    async def command_loop(self):
+        loop = asyncio.get_running_loop()
+        while self.running:
+            try:
+                command = await loop.run_in_executor(None, functools.partial(self.commands.get, timeout=1))
+            except queue.Empty:
+                continue
+            await self.handle_command(command)
+    
+    async def run(self):
+        logger.info(f"Shard {self.shard_id}: {len(self.tracked_accounts)} akun")
+        await self.command_loop()
+        await self.stop_monitoring()
+        for task in list(self.baseline_requests):
+            task.cancel()
+        self.twitter_executor.shutdown(wait=False)
+        logger.info(f"Shard {self.shard_id} berhenti")
+
+
+def run_shard_worker(shard_id, shards, twitter_credentials, commands, events):
+    """Entry point proses worker shard"""
+    worker = ShardWorker(shard_id, shards, twitter_credentials, commands, events)
+    asyncio.run(worker.run())
+
+
+class TwitterFollowingTracker(FollowingMonitor):
+    def __init__(self, twitter_credentials, telegram_bot_token, client_factory=None, telegram_bot=None,
+                 telegram_request=None):
+        # Mode sharded: coordinator hanya pakai bagiannya, sisanya dibagi ke worker (start_shard)
+        shards = shard_count(twitter_credentials, TRACKER_SHARDS) if TRACKER_SHARDS > 1 else 1
+        super().__init__(
+            credentials_for_shard(twitter_credentials, None, shards) if shards > 1 else twitter_credentials,
+            StateStore(DB_PATH), client_factory
+        )
+        self.twitter_credentials = twitter_credentials
         
-        self.telegram_app = Application.builder().token(telegram_bot_token).build()
+        # concurrent_updates supaya /status, /list dll tidak antri di belakang /add user lain
+        builder = (
+            Application.builder()
+            .token(telegram_bot_token)
+            .concurrent_updates(True)
+            .post_init(self.post_init)
+            .post_stop(self.post_stop)
+            .post_shutdown(self.post_shutdown)
+        )
+        if telegram_request:
+            # Bot API palsu (benchmarks/webhook_harness.py): run_webhook/run_polling tanpa jaringan
+            builder = builder.request(telegram_request)
+        self.telegram_app = builder.build()
         
-        self.tracked_accounts = {}
-        self.chat_ids = set()
-        self.monitoring = False
+        # Notifikasi lewat antrian, deteksi tidak menunggu pengiriman
+        self.delivery = DeliveryQueue(telegram_bot or self.telegram_app.bot, metrics=self.metrics, store=self.store)
+        self.outbox = self.delivery
+        
+        # Langganan per chat + index routing chain/akun -> chat (dihitung ulang saat langganan berubah)
+        self.subscriptions = self.store.load_subscribers()
+        self.chain_routes = {}
+        self.account_routes = {}
+        self.rebuild_routes()
+        # Dijalankan ulang di post_init kalau sebelum restart monitoring aktif
+        self.resume_monitoring = self.store.get_meta('monitoring') == '1'
+        # (chat_id, message_id keyboard) -> sesi /add ringkas, lihat prune_pending_adds
         self.pending_adds = {}
+        self.baseline_jobs = asyncio.Queue()
+        self.baseline_tasks = []
+        
+        # Loop background (monitoring, digest, shard) di luar Application.create_task,
+        # karena Application.stop() menunggu semua task itu selesai -> shutdown hang
+        self.background_tasks = set()
+        self.stopping = asyncio.Event()
+        self.started_at = time.time()
+        self.health_server = None
+        
+        # Mode sharded: monitoring dikerjakan proses worker, di sini hanya Telegram + notifikasi
+        self.shards = shards
+        self.shard_procs = {}
+        self.shard_commands = {}
+        self.shard_events = None
+        # request_id -> (shard_id, future) untuk baseline yang dikerjakan shard
+        self.shard_requests = {}
+        self.shard_request_ids = itertools.count(1)
+        
+        # Follow yang terdeteksi dalam CONVERGENCE_WINDOW: target ID -> {username: timestamp}
+        self.recent_follows = {}
+        self.convergence_alerted = {}
+        self.load_recent_follows()
+        
+        # Mode /digest: 0 = notifikasi langsung, >0 = batch per chain tiap N menit
+        self.digest_interval = int(self.store.get_meta('digest_interval', 0))
+        self.digest_buffer = {}
+        self.digest_last_flush = time.monotonic()
+        self.register_gauges()
+        
+        if self.tracked_accounts:
+            logger.info(f"State dimuat: {len(self.tracked_accounts)} akun, {len(self.subscriptions)} subscriber")
         
         logger.info("Bot berhasil diinisialisasi")
     
+    def snapshot_bytes(self):
+        return sum(data['following_list'].nbytes for data in self.tracked_accounts.values())
+    
+    def register_gauges(self):
+        """Gauge yang dihitung saat /metrics di-scrape"""
+        metrics = self.metrics
+        metrics.gauge('tracked_accounts', lambda: len(self.tracked_accounts))
+        metrics.gauge('following_snapshot_bytes', self.snapshot_bytes)
+        metrics.gauge('subscribers', lambda: len(self.subscriptions))
+        metrics.gauge('monitoring_active', lambda: int(self.monitoring))
+        metrics.gauge('delivery_queue_depth', lambda: self.delivery.pending)
+        metrics.gauge('profile_cache_entries', lambda: len(self.profiles.entries))
+        metrics.gauge('profile_cache_hit_ratio', lambda: self.profiles.stats()['hit_rate'])
+        metrics.gauge('twitter_credentials_healthy', lambda: len(self.pool.healthy()))
+        metrics.gauge('pending_add_sessions', lambda: len(self.pending_adds))
+        metrics.gauge('baseline_queue_depth', lambda: self.baseline_jobs.qsize())
+    
+    def metrics_summary(self):
+        """Ringkasan metrics untuk /status"""
+        metrics = self.metrics
+        endpoints = sorted({
+            dict(labels)['endpoint'] for name, labels in list(metrics.counters) if name == 'twitter_api_requests_total'
+        })
+        api_lines = "\n".join(
+            f"  {endpoint}: {metrics.total('twitter_api_requests_total', endpoint=endpoint)} req, "
+            f"429 {metrics.total('twitter_api_requests_total', endpoint=endpoint, status='rate_limited')}"
+            for endpoint in endpoints
+        ) or "  Belum ada request"
+        waited = metrics.summary('twitter_rate_limit_wait_seconds')
+        cycle = metrics.summary('monitor_cycle_seconds')
+        account = metrics.summary('check_account_seconds')
+        gap = metrics.summary('follow_detection_gap_seconds')
+        return f"""📈 <b>Metrics</b>
+🌐 API Twitter:
+{api_lines}
+⏳ Tunggu rate limit: {waited['sum']:.0f}s ({waited['count']}x)
+🔁 Cycle: terakhir {cycle['last']:.1f}s / p95 {cycle['p95']:.1f}s ({cycle['count']} cycle)
+👤 Per akun: p50 {account['p50']:.2f}s / p95 {account['p95']:.2f}s
+🎯 Jarak deteksi (maks): p50 {gap['p50'] / 60:.1f} min / p95 {gap['p95'] / 60:.1f} min
+💾 Snapshot following: {self.snapshot_bytes() / 2**20:.1f} MB"""
+    
     def escape_html(self, text):
         """Escape HTML characters"""
         return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
@@ -75,7 +1916,10 @@ class TwitterFollowingTracker:
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handler untuk /start command"""
         chat_id = update.effective_chat.id
-        self.chat_ids.add(chat_id)
+        if chat_id not in self.subscriptions:
+            self.subscriptions[chat_id] = None
+            self.store.add_subscriber(chat_id)
+            self.rebuild_routes()
         
         welcome_msg = """
 ╔═══════════════════════╗
@@ -91,11 +1935,19 @@ class TwitterFollowingTracker:
 📋 <b>Perintah:</b>
 ━━━━━━━━━━━━━━━━━━━━━━
 /add @username - Tambah tracking
+/import ETH - Tambah banyak (teks/CSV/JSON)
+/export - Download daftar tracking
 /list - Lihat daftar
 /remove @username - Hapus tracking
+/priority @username high - Cek lebih sering
 /start_monitoring - Mulai track
 /stop_monitoring - Stop track
 /status - Cek status
+/subscribe SOL @username - Filter alert chat ini
+/unsubscribe SOL - Hapus filter (tanpa argumen: stop semua)
+/digest 30 - Ringkasan per chain tiap 30 menit
+/trending ETH - Target yang di-follow banyak CT
+/history @username 7d - Riwayat follow/unfollow
 
 💡 <b>Label chain untuk identifikasi CT
 mana yang aktif di chain apa</b>
@@ -121,17 +1973,19 @@ mana yang aktif di chain apa</b>
         loading_msg = await update.message.reply_text(f"⏳ Mengecek @{username}...")
         
         try:
-            user = self.twitter_client.get_user(
-                username=username,
-                user_fields=['public_metrics']
-            )
+            user_data = self.profiles.get_by_username(username)
+            if user_data is None:
+                # Ambil semua PROFILE_FIELDS sekalian supaya entry cache bisa dipakai di mana saja
+                user = await self.twitter_call(
+                    'get_user',
+                    username=username,
+                    user_fields=PROFILE_FIELDS
+                )
+                user_data = user.data
+                if user_data:
+                    self.profiles.put(user_data)
             
-            if user.data:
-                self.pending_adds[chat_id] = {
-                    'username': username,
-                    'user_data': user.data
-                }
-                
+            if user_data:
                 # Create keyboard 4 kolom
                 keyboard = []
                 row = []
@@ -152,58 +2006,69 @@ mana yang aktif di chain apa</b>
 ✅ <b>Akun Ditemukan</b>
 
 👤 @{username}
-📝 {self.escape_html(user.data.name)}
-👥 {user.data.public_metrics['followers_count']:,} followers
-➡️ {user.data.public_metrics['following_count']:,} following
+📝 {self.escape_html(user_data.name)}
+👥 {user_data.public_metrics['followers_count']:,} followers
+➡️ {user_data.public_metrics['following_count']:,} following
 
 ⛓️ <b>Pilih Chain:</b>
 Label untuk identifikasi CT ini aktif di chain mana
                 """
                 
+                # Beberapa /add di chat yang sama tidak saling timpa: sesi per pesan keyboard
+                self.prune_pending_adds()
+                self.pending_adds[(chat_id, loading_msg.message_id)] = {
+                    'username': username,
+                    'user': {
+                        'id': user_data.id,
+                        'username': user_data.username,
+                        'name': user_data.name,
+                        'public_metrics': {
+                            'followers_count': user_data.public_metrics['followers_count'],
+                            'following_count': user_data.public_metrics['following_count'],
+                        },
+                    },
+                    'expires': time.monotonic() + PENDING_ADD_TTL,
+                }
+                
                 await loading_msg.edit_text(msg, parse_mode='HTML', reply_markup=reply_markup)
                 
         except Exception as e:
             await loading_msg.edit_text(f"❌ Error: {str(e)}")
     
+    def prune_pending_adds(self):
+        """Buang sesi /add yang tidak pernah dipilih chain-nya"""
+        now = time.monotonic()
+        for key in [key for key, pending in self.pending_adds.items() if pending['expires'] < now]:
+            del self.pending_adds[key]
+    
     async def chain_selection_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handler untuk chain selection"""
+        """Handler untuk chain selection; baseline dikerjakan antrian background"""
         query = update.callback_query
         await query.answer()
         
-        chat_id = query.message.chat_id
         chain_code = query.data.replace('chain_', '')
         
-        if chat_id not in self.pending_adds:
+        # pop: klik ganda pada keyboard yang sama tidak mendaftarkan akun dua kali
+        self.prune_pending_adds()
+        pending = self.pending_adds.pop((query.message.chat_id, query.message.message_id), None)
+        if pending is None or chain_code not in CHAINS:
             await query.edit_message_text("❌ Session expired, /add lagi")
             return
         
-        pending = self.pending_adds[chat_id]
         username = pending['username']
-        user_data = pending['user_data']
-        
+        user_data = tweepy.User(pending['user'])
+        queued = self.baseline_jobs.qsize()
+        future = self.queue_baseline(user_data)
+        await query.edit_message_text(
+            f"⏳ Memuat following list awal @{username}..." + (f" (antrian: {queued})" if queued else "")
+        )
+        self.spawn(self.finish_add(query.message, username, user_data, chain_code, future))
+    
+    async def finish_add(self, message, username, user_data, chain_code, future):
+        """Tunggu baseline dari antrian lalu daftarkan akun hasil /add"""
         try:
-            # Initialize following list
-            init_msg = await query.edit_message_text("⏳ Memuat following list awal...")
-            
-            following = self.twitter_client.get_users_following(
-                id=user_data.id,
-                max_results=1000,
-                user_fields=['name', 'username', 'public_metrics']
-            )
-            
-            following_set = set()
-            if following.data:
-                following_set = {user.id for user in following.data}
-            
-            self.tracked_accounts[username] = {
-                'id': user_data.id,
-                'name': user_data.name,
-                'chain': chain_code,
-                'followers': user_data.public_metrics['followers_count'],
-                'following_count': user_data.public_metrics['following_count'],
-                'following_list': following_set,
-                'last_check': datetime.now()
-            }
+            following_set = await future
+            self.register_account(username, user_data, chain_code, following_set)
             
             chain_info = CHAINS[chain_code]
             msg = f"""
@@ -216,13 +2081,85 @@ Label untuk identifikasi CT ini aktif di chain mana
 
 Ketik /start_monitoring untuk mulai!
             """
-            await init_msg.edit_text(msg, parse_mode='HTML')
-            
-            del self.pending_adds[chat_id]
+            await message.edit_text(msg, parse_mode='HTML')
             logger.info(f"Ditambahkan: @{username} ({chain_code}) - {len(following_set)} following")
             
+        except asyncio.CancelledError:
+            # Job baseline dibatalkan saat shutdown
+            await self.edit_progress(message, f"❌ Tambah @{username} dibatalkan (bot restart), /add lagi")
+            raise
         except Exception as e:
-            await query.edit_message_text(f"❌ Error: {str(e)}")
+            await self.edit_progress(message, f"❌ Error: {self.escape_html(str(e))}")
+    
+    async def fetch_baseline(self, user_data):
+        """Baseline following (cukup ID saja); mode sharded dikerjakan shard pemilik akun"""
+        if self.shards > 1:
+            return FollowingSnapshot(await self.request_shard_baseline(user_data.id))
+        following, _ = await self.fetch_following(user_data.id)
+        return FollowingSnapshot(user.id for user in following)
+    
+    async def request_shard_baseline(self, account_id):
+        """Minta shard pemilik akun fetch baseline (budget following hanya dipakai worker)"""
+        request_id = next(self.shard_request_ids)
+        shard_id = shard_for(account_id, self.shards)
+        future = asyncio.get_running_loop().create_future()
+        self.shard_requests[request_id] = (shard_id, future)
+        try:
+            self.shard_commands[shard_id].put(('baseline', request_id, account_id))
+            return await future
+        finally:
+            self.shard_requests.pop(request_id, None)
+    
+    def register_account(self, username, user_data, chain_code, following_set, priority=None):
+        """Simpan akun + baseline ke state, DB dan shard pemiliknya"""
+        old = self.tracked_accounts.get(username)
+        self.tracked_accounts[username] = {
+            'id': user_data.id,
+            'name': user_data.name,
+            'chain': chain_code,
+            'followers': user_data.public_metrics['followers_count'],
+            'following_count': user_data.public_metrics['following_count'],
+            'following_list': following_set,
+            'cycles_since_full': 0,
+            'last_check': datetime.now(),
+            'priority': priority or (old['priority'] if old else 'normal'),
+            'follow_rate': old['follow_rate'] if old else POLL_RATE_PRIOR,
+            'last_follow': old['last_follow'] if old else None
+        }
+        self.store.save_account(username, self.tracked_accounts[username], following=following_set)
+        self.send_to_shard(user_data.id, ('add', username))
+    
+    def queue_baseline(self, user_data):
+        """Antrikan fetch baseline; return future berisi FollowingSnapshot"""
+        future = asyncio.get_running_loop().create_future()
+        self.baseline_jobs.put_nowait((user_data, future))
+        return future
+    
+    async def baseline_worker(self):
+        """Proses antrian baseline; rate limit ditangani twitter_call"""
+        while True:
+            user_data, future = await self.baseline_jobs.get()
+            try:
+                result = await self.fetch_baseline(user_data)
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.baseline_jobs.task_done()
+    
+    def cancel_baselines(self):
+        """Shutdown: hentikan worker baseline dan batalkan job yang masih antri"""
+        for task in self.baseline_tasks:
+            task.cancel()
+        self.baseline_tasks = []
+        while not self.baseline_jobs.empty():
+            _, future = self.baseline_jobs.get_nowait()
+            future.cancel()
     
     async def list_accounts(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handler untuk /list command"""
@@ -250,8 +2187,9 @@ Ketik /start_monitoring untuk mulai!
             msg += f"\n{chain_info['emoji']} <b>{chain_info['name']}</b>\n"
             for username, data in accounts:
                 following_count = len(data['following_list'])
-                msg += f"  • @{username} - {self.escape_html(data['name'])}\n"
-                msg += f"    ➡️ {following_count} following\n"
+                star = " ⭐" if data.get('priority') == 'high' else ""
+                msg += f"  • @{username} - {self.escape_html(data['name'])}{star}\n"
+                msg += f"    ➡️ {following_count} following | ~{data.get('follow_rate', 0.0) * 24:.1f} follow/hari\n"
         
         msg += f"\n━━━━━━━━━━━━━━━━━━━━━━\n"
         msg += f"📊 Total: {len(self.tracked_accounts)} akun"
@@ -267,59 +2205,391 @@ Ketik /start_monitoring untuk mulai!
         username = context.args[0].replace('@', '')
         
         if username in self.tracked_accounts:
-            del self.tracked_accounts[username]
+            data = self.tracked_accounts.pop(username)
+            self.store.remove_account(username, data['id'])
+            self.send_to_shard(data['id'], ('remove', username))
             await update.message.reply_text(f"✅ @{username} dihapus")
             logger.info(f"Dihapus: @{username}")
         else:
             await update.message.reply_text(f"❌ @{username} tidak ditemukan")
     
-    async def check_following(self):
-        """Cek following baru untuk semua tracked accounts"""
-        for username, data in self.tracked_accounts.items():
-            try:
-                logger.info(f"Checking @{username}...")
-                
-                # Get current following list
-                following = self.twitter_client.get_users_following(
-                    id=data['id'],
-                    max_results=1000,
-                    user_fields=['name', 'username', 'public_metrics', 'description', 'created_at']
+    async def priority_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk /priority @username high|normal"""
+        if len(context.args) < 2 or context.args[1].lower() not in ('high', 'normal'):
+            await update.message.reply_text("❌ Gunakan: /priority @username high|normal")
+            return
+        
+        username = context.args[0].replace('@', '')
+        level = context.args[1].lower()
+        data = self.tracked_accounts.get(username)
+        if not data:
+            await update.message.reply_text(f"❌ @{username} tidak ditemukan")
+            return
+        
+        data['priority'] = level
+        self.store.save_account(username, data)
+        self.send_to_shard(data['id'], ('update', username, {'priority': level}))
+        interval = self.priority.interval(data, time.time())
+        await update.message.reply_text(
+            f"✅ Prioritas @{username}: {level}\n"
+            f"⏱️ Interval cek sekarang ~{math.ceil(interval / 60)} menit"
+        )
+        logger.info(f"Prioritas @{username}: {level}")
+    
+    async def import_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk /import [CHAIN] - daftar username,chain dari teks, file CSV/JSON atau reply ke file"""
+        message = update.message
+        document = message.document
+        if document is None and message.reply_to_message:
+            document = message.reply_to_message.document
+        
+        # Baris pertama: /import [CHAIN default] [akun...]; baris berikutnya daftar akun
+        lines = ((message.caption if message.document else message.text) or '').split('\n')
+        head = lines[0].split()[1:]
+        default_chain = None
+        if head and head[0].upper() in CHAINS:
+            default_chain = head.pop(0).upper()
+        body = '\n'.join([' '.join(head)] + lines[1:])
+        
+        try:
+            if document:
+                file = await document.get_file()
+                body = bytes(await file.download_as_bytearray()).decode('utf-8-sig')
+            entries, invalid = parse_account_list(body, default_chain)
+        except (ValueError, csv.Error) as e:
+            await message.reply_text(f"❌ Format tidak valid: {e}")
+            return
+        
+        if not entries:
+            await message.reply_text(
+                "❌ Gunakan: /import [CHAIN] lalu satu akun per baris\n"
+                "Contoh:\n/import\nlookonchain,ETH\n@ansem SOL\n\n"
+                "Atau kirim file CSV/JSON (username,chain[,priority]) dengan caption /import"
+            )
+            return
+        
+        progress = await message.reply_text(f"⏳ Import {len(entries)} akun...")
+        self.spawn(self.run_import(progress, entries, invalid))
+    
+    async def run_import(self, progress, entries, invalid):
+        """Resolve username per batch, antrikan baseline, lapor progress di satu pesan"""
+        known = {username.lower() for username in self.tracked_accounts}
+        existing = [username for username, _, _ in entries if username.lower() in known]
+        entries = [entry for entry in entries if entry[0].lower() not in known]
+        added, not_found, failed = [], [], []
+        
+        try:
+            profiles = await self.resolve_usernames([username for username, _, _ in entries])
+        except Exception as e:
+            await progress.edit_text(f"❌ Lookup username gagal: {e}")
+            return
+        
+        jobs = {}
+        for username, chain, priority in entries:
+            user_data = profiles.get(username.lower())
+            if user_data is None:
+                not_found.append(username)
+                continue
+            jobs[self.queue_baseline(user_data)] = (username, user_data, chain, priority)
+        
+        def report(final=False):
+            title = "✅ <b>Import selesai</b>" if final else f"⏳ <b>Import</b> baseline {len(jobs) - len(pending)}/{len(jobs)}"
+            lines = [
+                title,
+                "",
+                f"➕ Ditambahkan: {len(added)}",
+                f"⏭️ Sudah di-track: {len(existing)}",
+                f"❓ Tidak ditemukan: {len(not_found)}",
+                f"⚠️ Gagal baseline: {len(failed)}",
+                f"❌ Format salah: {len(invalid)}",
+            ]
+            if final:
+                for label, names in (("Tidak ditemukan", not_found), ("Gagal", failed), ("Format salah", invalid)):
+                    if names:
+                        shown = ', '.join(self.escape_html(name) for name in names[:20])
+                        more = f" (+{len(names) - 20})" if len(names) > 20 else ""
+                        lines.append(f"\n<b>{label}:</b> {shown}{more}")
+                if added and not self.monitoring:
+                    lines.append("\nKetik /start_monitoring untuk mulai!")
+            return '\n'.join(lines)
+        
+        pending = set(jobs)
+        last_edit = time.monotonic()
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=IMPORT_PROGRESS_INTERVAL)
+            known = {username.lower() for username in self.tracked_accounts}
+            for future in done:
+                username, user_data, chain, priority = jobs[future]
+                if future.cancelled() or future.exception():
+                    logger.warning(f"Baseline @{username} gagal: {future.exception() if not future.cancelled() else 'dibatalkan'}")
+                    failed.append(username)
+                    continue
+                # Bisa saja sudah di-/add manual selama import berjalan
+                if username.lower() in known:
+                    existing.append(username)
+                    continue
+                self.register_account(username, user_data, chain, future.result(), priority)
+                known.add(username.lower())
+                added.append(username)
+            
+            if pending and time.monotonic() - last_edit >= IMPORT_PROGRESS_INTERVAL:
+                last_edit = time.monotonic()
+                await self.edit_progress(progress, report())
+        
+        await self.edit_progress(progress, report(final=True))
+        logger.info(f"Import: {len(added)} ditambahkan, {len(not_found)} tidak ditemukan, {len(failed)} gagal")
+    
+    async def edit_progress(self, message, text):
+        try:
+            await message.edit_text(text, parse_mode='HTML')
+        except telegram.error.TelegramError as e:
+            logger.warning(f"Gagal update progress: {e}")
+    
+    async def export_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk /export [csv|json] - file yang bisa di-/import ulang"""
+        fmt = context.args[0].lower() if context.args else 'csv'
+        if fmt not in ('csv', 'json'):
+            await update.message.reply_text("❌ Gunakan: /export [csv|json]")
+            return
+        if not self.tracked_accounts:
+            await update.message.reply_text("🔭 Belum ada tracking")
+            return
+        
+        rows = [
+            {'username': username, 'chain': data['chain'], 'priority': data.get('priority') or 'normal'}
+            for username, data in sorted(self.tracked_accounts.items(), key=lambda item: item[0].lower())
+        ]
+        if fmt == 'json':
+            content = json.dumps(rows, indent=2)
+        else:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=['username', 'chain', 'priority'])
+            writer.writeheader()
+            writer.writerows(rows)
+            content = buffer.getvalue()
+        
+        await update.message.reply_document(
+            document=io.BytesIO(content.encode()),
+            filename=f"tracked_accounts.{fmt}",
+            caption=f"📦 {len(rows)} akun"
+        )
+    
+    async def on_following_delta(self, username, data, added, removed, new_users):
+        """Catat follow/unfollow untuk konvergensi dan kirim notifikasi follow baru"""
+        if new_users:
+            await self.handle_new_follows(username, data, new_users)
+            await self.check_convergence(username, data['chain'], new_users)
+        for target_id in removed:
+            self.forget_follow(target_id, username)
+    
+    async def notify_system(self, message):
+        await self.send_to_all(message)
+    
+    def load_recent_follows(self):
+        """Bangun ulang recent_follows dari follow_events supaya window konvergensi selamat dari restart"""
+        usernames = {data['id']: username for username, data in self.tracked_accounts.items()}
+        for ts, account_id, target_id, kind in self.store.load_follow_window(time.time() - CONVERGENCE_WINDOW):
+            username = usernames.get(account_id)
+            if not username:
+                continue
+            if kind == EVENT_FOLLOW:
+                self.recent_follows.setdefault(target_id, {})[username] = ts
+            else:
+                self.forget_follow(target_id, username)
+        # Konvergensi yang sudah ada di window dianggap sudah di-alert sebelum restart
+        for target_id in self.recent_follows:
+            for chain in CHAINS:
+                count = len(self.recent_followers(target_id, chain))
+                if count >= CONVERGENCE_MIN:
+                    self.convergence_alerted[(target_id, chain)] = count
+    
+    def forget_follow(self, target_id, username):
+        """Unfollow: keluarkan akun dari follower target di window konvergensi"""
+        followers = self.recent_follows.get(target_id)
+        if not followers or followers.pop(username, None) is None:
+            return
+        if not followers:
+            del self.recent_follows[target_id]
+        # Jumlah turun -> alert lagi kalau nanti naik melewati jumlah sekarang
+        data = self.tracked_accounts.get(username)
+        key = (target_id, data['chain']) if data else None
+        if key in self.convergence_alerted:
+            self.convergence_alerted[key] = min(
+                self.convergence_alerted[key], len(self.recent_followers(target_id, key[1]))
+            )
+    
+    def prune_recent_follows(self):
+        """Buang follow yang sudah keluar dari window konvergensi"""
+        cutoff = time.time() - CONVERGENCE_WINDOW
+        for target_id in list(self.recent_follows):
+            followers = {u: ts for u, ts in self.recent_follows[target_id].items() if ts >= cutoff}
+            if followers:
+                self.recent_follows[target_id] = followers
+            else:
+                del self.recent_follows[target_id]
+                for key in [k for k in self.convergence_alerted if k[0] == target_id]:
+                    del self.convergence_alerted[key]
+    
+    def recent_followers(self, target_id, chain=None):
+        """Tracked accounts (opsional filter chain) yang follow target dalam window"""
+        cutoff = time.time() - CONVERGENCE_WINDOW
+        accounts = []
+        for username, ts in self.recent_follows.get(target_id, {}).items():
+            data = self.tracked_accounts.get(username)
+            if ts >= cutoff and data and (chain is None or data['chain'] == chain):
+                accounts.append(username)
+        return accounts
+    
+    async def check_convergence(self, username, chain, new_users):
+        """Catat follow baru dan kirim alert kalau beberapa akun satu chain follow target sama"""
+        now = time.time()
+        for user in new_users:
+            self.recent_follows.setdefault(user.id, {})[username] = now
+            
+            accounts = self.recent_followers(user.id, chain)
+            if len(accounts) < CONVERGENCE_MIN:
+                continue
+            # Alert ulang hanya kalau jumlah akun bertambah
+            if self.convergence_alerted.get((user.id, chain), 0) >= len(accounts):
+                continue
+            self.convergence_alerted[(user.id, chain)] = len(accounts)
+            await self.notify_convergence(user, chain, accounts)
+    
+    async def notify_convergence(self, user, chain, accounts):
+        """Alert konvergensi: N akun chain X follow @target"""
+        chain_info = CHAINS[chain]
+        hours = CONVERGENCE_WINDOW // 3600
+        accounts_text = "\n".join([f"  • @{username}" for username in accounts])
+        total = len(self.recent_followers(user.id))
+        
+        msg = f"""
+🔥 <b>KONVERGENSI!</b>
+
+{len(accounts)} akun {chain_info['emoji']} {chain} follow
+👤 <a href="https://twitter.com/{user.username}">@{user.username}</a> ({self.escape_html(user.name)})
+dalam {hours} jam terakhir
+
+{accounts_text}
+
+📊 Total di-follow {total} tracked akun (semua chain, {hours} jam)
+⏰ {datetime.now().strftime('%d/%m/%Y %H:%M WIB')}
+        """
+        await self.send_to_chats(self.route(chain, accounts), msg)
+        logger.info(f"Konvergensi: {len(accounts)} akun {chain} follow @{user.username}")
+    
+    async def handle_new_follows(self, username, data, new_users):
+        """Pilih format notifikasi: per user, digest per akun, atau buffer /digest interval"""
+        if self.digest_interval:
+            for new_user in new_users:
+                self.digest_buffer.setdefault(data['chain'], []).append((username, data['name'], new_user))
+        elif len(new_users) > DIGEST_THRESHOLD:
+            await self.notify_follow_digest(username, data['name'], data['chain'], new_users)
+        else:
+            for new_user in new_users:
+                await self.notify_new_follow(username, new_user, data['name'], data['chain'])
+    
+    def format_follow_line(self, user):
+        """Satu baris ringkas untuk digest"""
+        return (
+            f"👤 <a href=\"https://twitter.com/{user.username}\">@{user.username}</a>"
+            f" - {self.escape_html(user.name)} ({(user.public_metrics or {}).get('followers_count', 0):,} followers)"
+        )
+    
+    def paginate(self, header, lines, limit=TELEGRAM_MESSAGE_LIMIT):
+        """Gabung baris jadi pesan-pesan di bawah limit karakter Telegram"""
+        # Sisakan ruang untuk label halaman "(x/y)"
+        budget = limit - len(header) - 20
+        pages = []
+        current = []
+        size = 0
+        for line in lines:
+            if current and size + len(line) + 1 > budget:
+                pages.append(current)
+                current = []
+                size = 0
+            current.append(line)
+            size += len(line) + 1
+        if current:
+            pages.append(current)
+        
+        if len(pages) == 1:
+            return [header + "\n".join(pages[0])]
+        return [
+            f"{header}<i>({idx}/{len(pages)})</i>\n" + "\n".join(page)
+            for idx, page in enumerate(pages, 1)
+        ]
+    
+    async def notify_follow_digest(self, username, display_name, chain, new_users):
+        """Satu digest (dipecah per 4096 karakter) untuk banyak follow baru dari satu akun"""
+        chain_info = CHAINS[chain]
+        header = f"""
+👥 <b>{len(new_users)} FOLLOWING BARU!</b>
+
+🎯 <b>@{username}</b> ({self.escape_html(display_name)})
+⛓️ {chain_info['emoji']} {chain_info['name']}
+⏰ {datetime.now().strftime('%d/%m/%Y %H:%M WIB')}
+
+━━━━━━━━━━━━━━━━━━━━
+"""
+        lines = [self.format_follow_line(user) for user in new_users]
+        chats = self.route(chain, [username])
+        for msg in self.paginate(header, lines):
+            await self.send_to_chats(chats, msg)
+    
+    async def flush_digest(self):
+        """Kirim digest per chain dari buffer /digest interval"""
+        buffer, self.digest_buffer = self.digest_buffer, {}
+        for chain, entries in sorted(buffer.items()):
+            # Chat yang langganan chain dapat digest lengkap, chat dengan filter akun hanya akunnya
+            full = self.chain_routes.get(chain, frozenset())
+            groups = {None: full} if full else {}
+            for chat_id in self.route(chain, {username for username, _, _ in entries}) - full:
+                accounts = frozenset(
+                    username for username, _, _ in entries
+                    if username.lower() in self.subscriptions[chat_id]['accounts']
                 )
-                
-                if following.data:
-                    current_following = {user.id for user in following.data}
-                    
-                    # Detect new follows
-                    if data['following_list']:
-                        new_follows = current_following - data['following_list']
-                        
-                        if new_follows:
-                            logger.info(f"Found {len(new_follows)} new follows for @{username}")
-                            new_users = [user for user in following.data if user.id in new_follows]
-                            
-                            for new_user in new_users:
-                                await self.notify_new_follow(username, new_user, data['name'], data['chain'])
-                                await asyncio.sleep(1)  # Delay between notifications
-                    
-                    # Update following list
-                    data['following_list'] = current_following
-                    data['following_count'] = len(current_following)
-                    data['last_check'] = datetime.now()
-                
-                # Delay between accounts to avoid rate limit
-                await asyncio.sleep(60)  # 1 menit per akun
-                
-            except tweepy.errors.TooManyRequests as e:
-                logger.warning(f"⚠️ Rate limit hit! Menunggu 15 menit...")
-                await self.send_to_all("⚠️ <b>Rate Limit Twitter API</b>\n\nBot pause 15 menit untuk avoid ban")
-                await asyncio.sleep(900)  # Wait 15 minutes
-            except tweepy.errors.Forbidden as e:
-                logger.error(f"❌ Forbidden: {e}")
-                await self.send_to_all(f"❌ <b>Twitter API Error</b>\n\nCek Bearer Token atau akses API")
-                break
-            except Exception as e:
-                logger.error(f"Error cek @{username}: {e}")
-                await asyncio.sleep(10)
+                groups.setdefault(accounts, set()).add(chat_id)
+            
+            for accounts, chats in groups.items():
+                selected = entries if accounts is None else [entry for entry in entries if entry[0] in accounts]
+                for msg in self.format_digest(chain, selected):
+                    await self.send_to_chats(chats, msg)
+    
+    def format_digest(self, chain, entries):
+        chain_info = CHAINS[chain]
+        header = f"""
+📰 <b>DIGEST {chain_info['emoji']} {chain_info['name']}</b>
+{len(entries)} following baru dalam {self.digest_interval or 0} menit terakhir
+
+━━━━━━━━━━━━━━━━━━━━
+"""
+        lines = []
+        last_account = None
+        for username, display_name, user in entries:
+            if username != last_account:
+                lines.append(f"\n🎯 <b>@{username}</b> ({self.escape_html(display_name)})")
+                last_account = username
+            lines.append(self.format_follow_line(user))
+        return self.paginate(header, lines)
+    
+    async def digest_loop(self):
+        """Flush buffer digest sesuai interval /digest"""
+        while await self.pause(30):
+            if self.digest_interval and time.monotonic() - self.digest_last_flush >= self.digest_interval * 60:
+                self.digest_last_flush = time.monotonic()
+                await self.flush_digest()
+    
+    async def compaction_loop(self):
+        """Retensi log event follow/unfollow"""
+        while True:
+            try:
+                deleted = self.store.compact_events()
+                if deleted:
+                    logger.info(f"Compaction: {deleted} event lebih dari {EVENT_RETENTION_DAYS} hari dihapus")
+            except sqlite3.Error as e:
+                logger.error(f"Compaction event gagal: {e}")
+            if not await self.pause(EVENT_COMPACT_INTERVAL):
+                return
     
     async def notify_new_follow(self, username, new_user, display_name, chain):
         """Notifikasi following baru"""
@@ -343,6 +2613,7 @@ Ketik /start_monitoring untuk mulai!
             bio_text = self.escape_html(new_user.description[:150])
             bio = f"\n📝 {bio_text}{'...' if len(new_user.description) > 150 else ''}"
         
+        metrics = new_user.public_metrics or {}
         msg = f"""
 👥 <b>FOLLOWING BARU!</b>
 
@@ -354,34 +2625,481 @@ Ketik /start_monitoring untuk mulai!
 
 👤 <a href="https://twitter.com/{new_user.username}">@{new_user.username}</a>
 📝 {self.escape_html(new_user.name)}
-👥 {new_user.public_metrics['followers_count']:,} followers
-💬 {new_user.public_metrics['tweet_count']:,} tweets{bio}{account_age}
+👥 {metrics.get('followers_count', 0):,} followers
+💬 {metrics.get('tweet_count', 0):,} tweets{bio}{account_age}
 
 ⏰ {datetime.now().strftime('%d/%m/%Y %H:%M WIB')}
         """
-        await self.send_to_all(msg)
+        await self.send_to_chats(self.route(chain, [username]), msg)
     
     async def send_to_all(self, message):
-        """Kirim ke semua subscriber"""
-        for chat_id in self.chat_ids:
+        """Kirim ke semua subscriber (pesan sistem, lewat delivery queue)"""
+        # Filter kosong = chat sudah /unsubscribe tanpa argumen, termasuk pesan sistem
+        await self.send_to_chats([
+            chat_id for chat_id, subscription in self.subscriptions.items()
+            if subscription is None or subscription['chains'] or subscription['accounts']
+        ], message)
+    
+    async def send_to_chats(self, chat_ids, message):
+        for chat_id in chat_ids:
+            self.delivery.enqueue(chat_id, message)
+    
+    def rebuild_routes(self):
+        """Index routing: chain -> chat dan akun -> chat, supaya alert tidak scan semua langganan"""
+        chain_routes = {chain: set() for chain in CHAINS}
+        account_routes = {}
+        for chat_id, subscription in self.subscriptions.items():
+            if subscription is None:
+                for chats in chain_routes.values():
+                    chats.add(chat_id)
+                continue
+            for chain in subscription['chains']:
+                chain_routes.setdefault(chain, set()).add(chat_id)
+            for account in subscription['accounts']:
+                account_routes.setdefault(account, set()).add(chat_id)
+        self.chain_routes = {chain: frozenset(chats) for chain, chats in chain_routes.items()}
+        self.account_routes = {account: frozenset(chats) for account, chats in account_routes.items()}
+    
+    def route(self, chain, usernames=()):
+        """Chat yang langganan chain ini atau salah satu akun"""
+        chats = self.chain_routes.get(chain, frozenset())
+        for username in usernames:
+            extra = self.account_routes.get(username.lower())
+            if extra:
+                chats = chats | extra
+        return chats
+    
+    async def monitoring_cycle(self):
+        self.prune_recent_follows()
+        # Mode sharded: cek following dikerjakan worker, coordinator hanya merawat window konvergensi
+        if self.shards == 1:
+            await super().monitoring_cycle()
+    
+    async def start_monitoring(self):
+        self.broadcast_shards(('monitor', True))
+        return await super().start_monitoring()
+    
+    async def stop_monitoring(self):
+        self.broadcast_shards(('monitor', False))
+        await super().stop_monitoring()
+    
+    async def pause(self, seconds):
+        """Sleep yang langsung bangun saat shutdown; return False kalau sedang stopping"""
+        if seconds > 0:
+            try:
+                await asyncio.wait_for(self.stopping.wait(), seconds)
+            except asyncio.TimeoutError:
+                pass
+        return not self.stopping.is_set()
+    
+    def spawn(self, coro):
+        """Jalankan loop background yang di-drain di post_stop"""
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+    
+    def start_shard(self, shard_id):
+        """Spawn (atau respawn) satu proses worker; state diambil dari DB"""
+        ctx = multiprocessing.get_context('spawn')
+        commands = ctx.Queue()
+        process = ctx.Process(
+            target=run_shard_worker,
+            args=(
+                shard_id, self.shards,
+                credentials_for_shard(self.twitter_credentials, shard_id, self.shards),
+                commands, self.shard_events
+            ),
+            name=f"shard-{shard_id}",
+            daemon=True
+        )
+        process.start()
+        self.shard_procs[shard_id] = process
+        self.shard_commands[shard_id] = commands
+        commands.put(('monitor', self.monitoring))
+        logger.info(f"Shard {shard_id} dijalankan (pid {process.pid})")
+        
+        # Respawn: baseline yang belum dijawab proses lama tidak akan pernah datang
+        for owner, future in list(self.shard_requests.values()):
+            if owner == shard_id and not future.done():
+                future.set_exception(RuntimeError(f"Shard {shard_id} restart, coba lagi"))
+    
+    def send_to_shard(self, account_id, command):
+        if self.shards > 1:
+            self.shard_commands[shard_for(account_id, self.shards)].put(command)
+    
+    def broadcast_shards(self, command):
+        for commands in self.shard_commands.values():
+            commands.put(command)
+    
+    async def shard_event_loop(self):
+        """Terima event dari worker (delta follow, state akun, pesan sistem)"""
+        loop = asyncio.get_running_loop()
+        while not self.stopping.is_set():
             try:
-                await self.telegram_app.bot.send_message(
-                    chat_id=chat_id,
-                    text=message,
-                    parse_mode='HTML',
-                    disable_web_page_preview=False
+                event = await loop.run_in_executor(None, functools.partial(self.shard_events.get, timeout=1))
+            except queue.Empty:
+                # Worker mati -> respawn, snapshot tetap aman di DB
+                for shard_id, process in list(self.shard_procs.items()):
+                    if not process.is_alive():
+                        logger.error(f"Shard {shard_id} mati (exit {process.exitcode}), restart")
+                        self.start_shard(shard_id)
+                continue
+            try:
+                await self.handle_shard_event(event)
+            except Exception as e:
+                logger.error(f"Error event shard {event[0]}: {e}")
+    
+    async def handle_shard_event(self, event):
+        kind = event[0]
+        if kind == 'system':
+            await self.send_to_all(event[1])
+            return
+        if kind == 'baseline':
+            _, request_id, following_ids, error = event
+            _, future = self.shard_requests.get(request_id, (None, None))
+            if future and not future.done():
+                if error is None:
+                    future.set_result(following_ids)
+                else:
+                    future.set_exception(RuntimeError(error))
+            return
+        
+        username = event[1]
+        data = self.tracked_accounts.get(username)
+        if not data:
+            return
+        
+        if kind == 'delta':
+            _, _, added, removed, new_users = event
+            users = [tweepy.User(user) for user in new_users]
+            for user in users:
+                self.profiles.put(user)
+            await self.on_following_delta(username, data, added, removed, users)
+            data['following_list'] = (data['following_list'] | added) - removed
+        elif kind == 'checked':
+            data.update(event[2])
+    
+    async def post_init(self, application):
+        """Start delivery workers dan lanjutkan monitoring kalau sebelumnya aktif"""
+        self.delivery.start()
+        self.spawn(self.digest_loop())
+        self.spawn(self.compaction_loop())
+        self.baseline_tasks = [asyncio.create_task(self.baseline_worker()) for _ in range(BASELINE_WORKERS)]
+        if HEALTH_PORT:
+            self.health_server = await asyncio.start_server(self.handle_health, HEALTH_HOST, HEALTH_PORT)
+            logger.info(f"Health endpoint di http://{HEALTH_HOST}:{HEALTH_PORT}/health (metrics di /metrics)")
+        
+        if self.shards > 1:
+            self.shard_events = multiprocessing.get_context('spawn').Queue()
+            for shard_id in range(self.shards):
+                self.start_shard(shard_id)
+            self.spawn(self.shard_event_loop())
+        
+        if self.resume_monitoring and self.tracked_accounts:
+            logger.info("Melanjutkan monitoring dari state tersimpan")
+            await self.start_monitoring()
+    
+    async def post_stop(self, application):
+        """Handler yang sedang jalan sudah selesai (Application.stop); drain loop background"""
+        self.stopping.set()
+        # State disimpan per akun, jadi cycle yang sedang jalan aman di-cancel
+        # (flag 'monitoring' di DB tidak diubah -> lanjut lagi setelah restart)
+        await self.stop_monitoring()
+        self.cancel_baselines()
+        if self.background_tasks:
+            done, pending = await asyncio.wait(self.background_tasks, timeout=SHUTDOWN_DRAIN_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if pending:
+                logger.warning(f"{len(pending)} task background di-cancel setelah {SHUTDOWN_DRAIN_TIMEOUT}s")
+        await self.flush_digest()
+    
+    async def post_shutdown(self, application):
+        """Stop delivery workers, health endpoint dan proses shard"""
+        await self.delivery.stop(timeout=SHUTDOWN_DRAIN_TIMEOUT)
+        if self.health_server:
+            self.health_server.close()
+            await self.health_server.wait_closed()
+        
+        self.broadcast_shards(('stop',))
+        # join() blocking -> di thread supaya event loop tidak tertahan sampai 5s per shard
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(None, process.join, 5) for process in self.shard_procs.values()
+        ))
+        for process in self.shard_procs.values():
+            if process.is_alive():
+                process.terminate()
+    
+    async def handle_health(self, reader, writer):
+        """GET /health -> JSON status (503 selama shutdown), GET /metrics -> format Prometheus"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 5)
+            while (await asyncio.wait_for(reader.readline(), 5)) not in (b'\r\n', b'\n', b''):
+                pass
+            path = request_line.split()[1].decode() if len(request_line.split()) > 1 else '/'
+            path = path.split('?')[0]
+            content_type = 'application/json'
+            if path == '/metrics':
+                status, body = '200 OK', self.metrics.render()
+                content_type = 'text/plain; version=0.0.4'
+            elif path != '/health':
+                status, body = '404 Not Found', {'error': 'not found'}
+            else:
+                status = '503 Service Unavailable' if self.stopping.is_set() else '200 OK'
+                body = {
+                    'status': 'stopping' if self.stopping.is_set() else 'ok',
+                    'mode': 'webhook' if WEBHOOK_URL else 'polling',
+                    'monitoring': self.monitoring,
+                    'accounts': len(self.tracked_accounts),
+                    'delivery_queue': self.delivery.pending,
+                    'uptime': int(time.time() - self.started_at),
+                }
+            payload = (body if isinstance(body, str) else json.dumps(body)).encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    
+    async def trending_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk /trending [chain] - target yang paling banyak di-follow dalam window"""
+        chain = context.args[0].upper() if context.args else None
+        if chain and chain not in CHAINS:
+            await update.message.reply_text(f"❌ Chain {chain} tidak dikenal")
+            return
+        
+        self.prune_recent_follows()
+        ranking = []
+        for target_id in self.recent_follows:
+            accounts = self.recent_followers(target_id, chain)
+            if len(accounts) >= 2:
+                ranking.append((len(accounts), target_id, accounts))
+        ranking.sort(key=lambda x: x[0], reverse=True)
+        
+        hours = CONVERGENCE_WINDOW // 3600
+        label = f"{CHAINS[chain]['emoji']} {chain}" if chain else "semua chain"
+        if not ranking:
+            await update.message.reply_text(f"🔭 Belum ada konvergensi ({label}, {hours} jam terakhir)")
+            return
+        
+        top = ranking[:10]
+        try:
+            profiles = await self.get_profiles([target_id for _, target_id, _ in top])
+        except Exception as e:
+            logger.warning(f"Gagal ambil profil trending: {e}")
+            profiles = {}
+        
+        msg = f"🔥 <b>Trending ({label}, {hours} jam)</b>\n\n"
+        for count, target_id, accounts in top:
+            profile = profiles.get(target_id)
+            if profile:
+                msg += f"👤 <a href=\"https://twitter.com/{profile.username}\">@{profile.username}</a> {self.escape_html(profile.name)}\n"
+            else:
+                msg += f"👤 ID {target_id}\n"
+            msg += f"    ➡️ {count} akun: {', '.join('@' + u for u in accounts)}\n"
+            msg += f"    📊 Total di-follow {len(self.recent_followers(target_id))} tracked akun (semua chain)\n"
+        
+        await update.message.reply_text(msg, parse_mode='HTML', disable_web_page_preview=True)
+    
+    def parse_window(self, arg):
+        """'30m' / '12h' / '7d' -> detik; None kalau bukan format window"""
+        match = re.fullmatch(r'(\d+)([mhd])', arg.lower())
+        if not match:
+            return None
+        return int(match.group(1)) * {'m': 60, 'h': 3600, 'd': 86400}[match.group(2)]
+    
+    async def history_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk /history [@username|chain] [follow|unfollow] [7d] - log event follow/unfollow"""
+        window = HISTORY_DEFAULT_WINDOW
+        account = chain = kind = None
+        for arg in context.args or []:
+            username = arg.replace('@', '')
+            if self.parse_window(arg):
+                window = self.parse_window(arg)
+            elif arg.lower() in ('follow', 'follows'):
+                kind = EVENT_FOLLOW
+            elif arg.lower() in ('unfollow', 'unfollows'):
+                kind = EVENT_UNFOLLOW
+            elif arg.upper() in CHAINS and not arg.startswith('@'):
+                chain = arg.upper()
+            elif username in self.tracked_accounts:
+                account = username
+            else:
+                await update.message.reply_text(
+                    f"❌ {arg} tidak dikenal\n\n"
+                    "Gunakan: /history [@username|chain] [follow|unfollow] [30m|12h|7d]\n"
+                    "Contoh: /history ETH follow 7d, /history unfollow 1d"
                 )
+                return
+        
+        account_id = self.tracked_accounts[account]['id'] if account else None
+        since = time.time() - window
+        events = self.store.query_events(since, account_id=account_id, chain=chain, kind=kind)
+        follows, unfollows = self.store.count_events(since, account_id=account_id, chain=chain)
+        
+        scope = f"@{account}" if account else f"{CHAINS[chain]['emoji']} {chain}" if chain else "semua akun"
+        if window % 86400 == 0:
+            label = f"{window // 86400} hari"
+        elif window % 3600 == 0:
+            label = f"{window // 3600} jam"
+        else:
+            label = f"{window // 60} menit"
+        if not events:
+            await update.message.reply_text(f"📭 Tidak ada event ({scope}, {label} terakhir)")
+            return
+        
+        # Username target unfollow (atau follow lama) yang tidak tersimpan di log
+        missing = [target_id for _, _, target_id, _, _, target_username in events if not target_username]
+        profiles = {}
+        if missing:
+            try:
+                profiles = await self.get_profiles(list(set(missing)))
             except Exception as e:
-                logger.error(f"Error kirim ke {chat_id}: {e}")
+                logger.warning(f"Gagal ambil profil history: {e}")
+        
+        usernames = {data['id']: username for username, data in self.tracked_accounts.items()}
+        lines = []
+        for ts, event_account_id, target_id, event_kind, event_chain, target_username in events:
+            target_username = target_username or getattr(profiles.get(target_id), 'username', None)
+            target = (
+                f"<a href=\"https://twitter.com/{target_username}\">@{target_username}</a>"
+                if target_username else f"ID {target_id}"
+            )
+            icon = "➕" if event_kind == EVENT_FOLLOW else "➖"
+            emoji = CHAINS.get(event_chain, {}).get('emoji', '')
+            source = usernames.get(event_account_id, event_account_id)
+            when = datetime.fromtimestamp(ts).strftime('%d/%m %H:%M')
+            lines.append(f"{icon} {emoji} @{source} → {target} <i>{when}</i>")
+        
+        total = {EVENT_FOLLOW: follows, EVENT_UNFOLLOW: unfollows}.get(kind, follows + unfollows)
+        header = f"📜 <b>History ({scope}, {label})</b>\n➕ {follows} follow | ➖ {unfollows} unfollow\n"
+        if len(events) < total:
+            header += f"<i>Menampilkan {len(events)} event terbaru</i>\n"
+        header += "\n"
+        for msg in self.paginate(header, lines):
+            await update.message.reply_text(msg, parse_mode='HTML', disable_web_page_preview=True)
     
-    async def monitoring_loop(self, context: ContextTypes.DEFAULT_TYPE):
-        """Loop monitoring"""
-        logger.info("Monitoring dimulai")
-        while self.monitoring:
-            if self.tracked_accounts:
-                await self.check_following()
+    async def digest_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk /digest command"""
+        if not context.args:
+            status = f"tiap {self.digest_interval} menit" if self.digest_interval else "OFF (notifikasi langsung)"
+            await update.message.reply_text(
+                f"📰 Digest: {status}\n\n"
+                "Gunakan: /digest 30 (menit) atau /digest off"
+            )
+            return
+        
+        arg = context.args[0].lower()
+        if arg == 'off':
+            interval = 0
+        elif arg.isdigit() and int(arg) > 0:
+            interval = int(arg)
+        else:
+            await update.message.reply_text("❌ Gunakan: /digest 30 (menit) atau /digest off")
+            return
+        
+        if not interval and self.digest_buffer:
+            await self.flush_digest()
+        
+        self.digest_interval = interval
+        self.digest_last_flush = time.monotonic()
+        self.store.set_meta('digest_interval', interval)
+        
+        if interval:
+            await update.message.reply_text(f"✅ Digest aktif: ringkasan per chain tiap {interval} menit")
+        else:
+            await update.message.reply_text("✅ Digest dimatikan, notifikasi kembali langsung")
+        logger.info(f"Digest interval: {interval} menit")
+    
+    def parse_subscription_args(self, args):
+        """Pisah argumen jadi chain dan akun (lowercase); return (chains, accounts, unknown)"""
+        tracked = {username.lower() for username in self.tracked_accounts}
+        chains, accounts, unknown = set(), set(), []
+        for arg in args:
+            if arg.upper() in CHAINS and not arg.startswith('@'):
+                chains.add(arg.upper())
+            elif arg.lstrip('@').lower() in tracked:
+                accounts.add(arg.lstrip('@').lower())
             else:
-                await asyncio.sleep(30)
+                unknown.append(arg)
+        return chains, accounts, unknown
+    
+    def describe_subscription(self, chat_id):
+        subscription = self.subscriptions.get(chat_id)
+        if chat_id not in self.subscriptions:
+            return "🔕 Chat ini belum terdaftar, ketik /start"
+        if subscription is None:
+            return "📢 Chat ini menerima semua alert"
+        if not subscription['chains'] and not subscription['accounts']:
+            return "🔕 Chat ini tidak menerima alert (/subscribe all untuk semua)"
+        chains = ', '.join(f"{CHAINS[c]['emoji']} {c}" for c in sorted(subscription['chains']) if c in CHAINS) or '-'
+        accounts = ', '.join(f"@{a}" for a in sorted(subscription['accounts'])) or '-'
+        return f"📢 Langganan chat ini:\n⛓️ Chain: {chains}\n👤 Akun: {accounts}"
+    
+    def save_subscription(self, chat_id, subscription):
+        self.subscriptions[chat_id] = subscription
+        self.store.set_subscription(chat_id, subscription)
+        self.rebuild_routes()
+    
+    async def subscribe_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk /subscribe [all|CHAIN|@username ...] - alert chat ini hanya yang cocok"""
+        chat_id = update.effective_chat.id
+        if not context.args:
+            await update.message.reply_text(
+                f"{self.describe_subscription(chat_id)}\n\n"
+                "Gunakan: /subscribe SOL ETH @username atau /subscribe all"
+            )
+            return
+        
+        if context.args[0].lower() == 'all':
+            subscription = None
+        else:
+            chains, accounts, unknown = self.parse_subscription_args(context.args)
+            if unknown:
+                await update.message.reply_text(f"❌ Bukan chain/akun yang di-track: {', '.join(unknown)}")
+                return
+            # Chat yang sebelumnya terima semua mulai dari filter kosong
+            current = self.subscriptions.get(chat_id) or {'chains': set(), 'accounts': set()}
+            subscription = {'chains': current['chains'] | chains, 'accounts': current['accounts'] | accounts}
+        
+        self.save_subscription(chat_id, subscription)
+        await update.message.reply_text(f"✅ {self.describe_subscription(chat_id)}")
+        logger.info(f"Langganan {chat_id}: {subscription}")
+    
+    async def unsubscribe_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handler untuk /unsubscribe [CHAIN|@username ...] - tanpa argumen stop semua alert"""
+        chat_id = update.effective_chat.id
+        if chat_id not in self.subscriptions:
+            await update.message.reply_text(self.describe_subscription(chat_id))
+            return
+        if not context.args:
+            subscription = {'chains': set(), 'accounts': set()}
+        else:
+            current = self.subscriptions.get(chat_id)
+            if current is None:
+                await update.message.reply_text(
+                    "⚠️ Chat ini menerima semua alert, pilih dulu yang mau diterima: /subscribe SOL @username"
+                )
+                return
+            chains, accounts, unknown = self.parse_subscription_args(context.args)
+            # Akun yang sudah di-/remove tetap bisa dihapus dari filter
+            stale = {arg.lstrip('@').lower() for arg in unknown} & current['accounts']
+            unknown = [arg for arg in unknown if arg.lstrip('@').lower() not in stale]
+            if unknown:
+                await update.message.reply_text(f"❌ Bukan chain/akun yang di-track: {', '.join(unknown)}")
+                return
+            subscription = {'chains': current['chains'] - chains, 'accounts': current['accounts'] - accounts - stale}
+        
+        self.save_subscription(chat_id, subscription)
+        await update.message.reply_text(f"✅ {self.describe_subscription(chat_id)}")
+        logger.info(f"Langganan {chat_id}: {subscription}")
     
     async def start_monitoring_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start monitoring"""
@@ -392,12 +3110,10 @@ Ketik /start_monitoring untuk mulai!
             )
             return
         
-        if self.monitoring:
+        if not await self.start_monitoring():
             await update.message.reply_text("⚠️ Monitoring sudah jalan")
             return
-        
-        self.monitoring = True
-        context.application.create_task(self.monitoring_loop(context))
+        self.store.set_meta('monitoring', 1)
         
         chain_counts = {}
         total_following = 0
@@ -411,9 +3127,9 @@ Ketik /start_monitoring untuk mulai!
             for c, count in sorted(chain_counts.items(), key=lambda x: x[1], reverse=True)
         ])
         
-        # Calculate check interval
-        accounts_count = len(self.tracked_accounts)
-        cycle_time = accounts_count * 1  # 1 menit per akun
+        # Estimasi interval dari budget rate limit yang sebenarnya
+        cycle_time = math.ceil(self.projected_cycle_seconds() / 60)
+        remaining, limit = self.pool.remaining(TWITTER_ENDPOINTS['get_users_following'])
         
         msg = f"""
 ✅ <b>Monitoring Aktif!</b>
@@ -422,20 +3138,19 @@ Ketik /start_monitoring untuk mulai!
 {chains_text}
 
 ➡️ Total: {total_following} following dipantau
-⏱️ Check interval: ~{cycle_time} menit per cycle
-⚠️ Twitter Free API: 15 req/15min limit
+⏱️ Check interval: ~{cycle_time} menit per cycle (worst case)
+⚠️ Following API: {remaining}/{limit} req tersisa per 15min
 📢 Notifikasi: Real-time
 
 <i>Rekomendasi: Track maksimal 5 akun untuk hasil optimal</i>
         """
         await update.message.reply_text(msg, parse_mode='HTML')
-        logger.info("Monitoring dimulai")
     
     async def stop_monitoring_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Stop monitoring"""
-        self.monitoring = False
+        await self.stop_monitoring()
+        self.store.set_meta('monitoring', 0)
         await update.message.reply_text("⏸️ Monitoring dihentikan")
-        logger.info("Monitoring dihentikan")
     
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Cek status bot"""
@@ -460,6 +3175,10 @@ Ketik /start_monitoring untuk mulai!
             latest = max(self.tracked_accounts.values(), key=lambda x: x['last_check'])
             last_check = f"\n🕐 Last check: {latest['last_check'].strftime('%H:%M:%S')}"
         
+        delivery = self.delivery.stats()
+        cache = self.profiles.stats()
+        healthy = len(self.pool.healthy())
+        
         msg = f"""
 📊 <b>Status Bot</b>
 
@@ -467,7 +3186,15 @@ Ketik /start_monitoring untuk mulai!
 
 👥 Total: {len(self.tracked_accounts)} akun
 ➡️ Monitoring: {total_following} following
-📢 Subscribers: {len(self.chat_ids)}{last_check}
+📢 Subscribers: {len(self.subscriptions)}{last_check}
+🔑 Credentials: {healthy}/{len(self.pool.clients)} aktif
+
+📤 Antrian notifikasi: {delivery['depth']}
+✉️ Terkirim: {delivery['sent']} (gagal {delivery['failed']})
+⏱️ Latency kirim: avg {delivery['latency_avg']:.1f}s / p95 {delivery['latency_p95']:.1f}s
+🗂️ Profile cache: {cache['size']} user, hit {cache['hits']} / miss {cache['misses']} ({cache['hit_rate']:.0%})
+
+{self.metrics_summary()}
 
 ⛓️ Per Chain:
 {chains_list}
@@ -480,18 +3207,43 @@ Ketik /start_monitoring untuk mulai!
         self.telegram_app.add_handler(CommandHandler('add', self.add_account))
         self.telegram_app.add_handler(CommandHandler('list', self.list_accounts))
         self.telegram_app.add_handler(CommandHandler('remove', self.remove_account))
+        self.telegram_app.add_handler(CommandHandler('priority', self.priority_command))
+        self.telegram_app.add_handler(CommandHandler('import', self.import_command))
+        self.telegram_app.add_handler(CommandHandler('export', self.export_command))
+        self.telegram_app.add_handler(MessageHandler(
+            filters.Document.ALL & filters.CaptionRegex(r'^/import\b'), self.import_command
+        ))
         self.telegram_app.add_handler(CommandHandler('start_monitoring', self.start_monitoring_command))
         self.telegram_app.add_handler(CommandHandler('stop_monitoring', self.stop_monitoring_command))
         self.telegram_app.add_handler(CommandHandler('status', self.status_command))
+        self.telegram_app.add_handler(CommandHandler('digest', self.digest_command))
+        self.telegram_app.add_handler(CommandHandler('subscribe', self.subscribe_command))
+        self.telegram_app.add_handler(CommandHandler('unsubscribe', self.unsubscribe_command))
+        self.telegram_app.add_handler(CommandHandler('trending', self.trending_command))
+        self.telegram_app.add_handler(CommandHandler('history', self.history_command))
         self.telegram_app.add_handler(CallbackQueryHandler(self.chain_selection_callback, pattern='^chain_'))
         
-        logger.info("🤖 Bot berjalan di Railway...")
-        # Use polling with drop_pending_updates to avoid conflicts
-        self.telegram_app.run_polling(
-            allowed_updates=Update.ALL_TYPES,
-            drop_pending_updates=True,  # Skip old updates
-            close_loop=False
-        )
+        if WEBHOOK_URL:
+            # Update yang masuk selama restart tetap di-antri Telegram, jadi tidak di-drop
+            logger.info(f"🤖 Bot berjalan (webhook) di {WEBHOOK_LISTEN}:{WEBHOOK_PORT}/{WEBHOOK_PATH}")
+            self.telegram_app.run_webhook(
+                listen=WEBHOOK_LISTEN,
+                port=WEBHOOK_PORT,
+                url_path=WEBHOOK_PATH,
+                webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+                secret_token=WEBHOOK_SECRET,
+                allowed_updates=Update.ALL_TYPES,
+                close_loop=False
+            )
+        else:
+            logger.info("🤖 Bot berjalan di Railway...")
+            # Use polling with drop_pending_updates to avoid conflicts
+            self.telegram_app.run_polling(
+                allowed_updates=Update.ALL_TYPES,
+                drop_pending_updates=True,  # Skip old updates
+                close_loop=False
+            )
+        self.twitter_executor.shutdown(wait=False)
 
 
 # ==================== MAIN ====================
@@ -499,26 +3251,36 @@ if __name__ == "__main__":
     TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
     
     # Try to get OAuth credentials first
-    twitter_credentials = {}
+    twitter_credentials = []
     
     if os.getenv("TWITTER_API_KEY") and os.getenv("TWITTER_API_SECRET"):
-        twitter_credentials = {
+        twitter_credentials.append({
+            'name': 'default',
             'api_key': os.getenv("TWITTER_API_KEY"),
             'api_secret': os.getenv("TWITTER_API_SECRET"),
             'access_token': os.getenv("TWITTER_ACCESS_TOKEN"),
             'access_secret': os.getenv("TWITTER_ACCESS_SECRET")
-        }
+        })
         logger.info("Found OAuth credentials")
     elif os.getenv("TWITTER_BEARER_TOKEN"):
-        twitter_credentials = {
+        twitter_credentials.append({
+            'name': 'default',
             'bearer_token': os.getenv("TWITTER_BEARER_TOKEN")
-        }
+        })
         logger.info("Found Bearer Token")
-    else:
+    
+    # Credential tambahan untuk pool (throughput naik linear per credential)
+    extra_credentials = load_extra_twitter_credentials()
+    if extra_credentials:
+        twitter_credentials.extend(extra_credentials)
+        logger.info(f"Found {len(extra_credentials)} extra credentials")
+    
+    if not twitter_credentials:
         logger.error("❌ No Twitter credentials found!")
         logger.error("Set either:")
         logger.error("  1. TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_SECRET")
         logger.error("  2. TWITTER_BEARER_TOKEN")
+        logger.error("  3. TWITTER_CREDENTIALS_FILE (JSON list) / TWITTER_BEARER_TOKEN_2..N")
         exit(1)
     
     if not TELEGRAM_BOT_TOKEN: